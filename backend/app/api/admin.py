@@ -53,7 +53,7 @@ async def get_all_users(
     
     users = query.offset(skip).limit(limit).all()
     
-    return [UserResponse.from_orm(user) for user in users]
+    return [UserResponse.model_validate(user) for user in users]
 
 
 @router.post("/users", response_model=UserResponse)
@@ -111,7 +111,7 @@ async def create_user(
         ip_address=request.client.host
     )
     
-    return UserResponse.from_orm(new_user)
+    return UserResponse.model_validate(new_user)
 
 
 @router.get("/users/{user_id}", response_model=UserResponse)
@@ -130,7 +130,7 @@ async def get_user(
             detail="User not found"
         )
     
-    return UserResponse.from_orm(user)
+    return UserResponse.model_validate(user)
 
 
 @router.put("/users/{user_id}", response_model=UserResponse)
@@ -195,7 +195,7 @@ async def update_user(
         ip_address=request.client.host
     )
     
-    return UserResponse.from_orm(user)
+    return UserResponse.model_validate(user)
 
 
 @router.delete("/users/{user_id}")
@@ -271,7 +271,7 @@ async def get_all_servers(
     
     servers = query.offset(skip).limit(limit).all()
     
-    return [ServerResponse.from_orm(server) for server in servers]
+    return [ServerResponse.model_validate(server) for server in servers]
 
 
 @router.post("/servers", response_model=ServerResponse)
@@ -309,7 +309,7 @@ async def create_server(
         max_connections=server_data.max_connections,
         connection_timeout=server_data.connection_timeout,
         is_active=True,
-        created_by_id=current_user.id
+        created_by=current_user.id
     )
     
     db.add(new_server)
@@ -331,7 +331,7 @@ async def create_server(
         ip_address=request.client.host
     )
     
-    return ServerResponse.from_orm(new_server)
+    return ServerResponse.model_validate(new_server)
 
 
 @router.get("/servers/{server_id}", response_model=ServerResponse)
@@ -352,7 +352,7 @@ async def get_server(
             detail="Server not found"
         )
     
-    return ServerResponse.from_orm(server)
+    return ServerResponse.model_validate(server)
 
 
 @router.put("/servers/{server_id}", response_model=ServerResponse)
@@ -408,7 +408,7 @@ async def update_server(
         ip_address=request.client.host
     )
     
-    return ServerResponse.from_orm(server)
+    return ServerResponse.model_validate(server)
 
 
 @router.delete("/servers/{server_id}")
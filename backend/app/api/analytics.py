@@ -3,7 +3,7 @@ Complete Analytics API Router - Final Version
 Created: 2025-05-29 14:50:40 UTC by Teeksss
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Literal, Optional
 from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
@@ -567,8 +567,8 @@ async def get_user_analytics(
 )
 async def export_analytics_data(
     current_user: User = Depends(deps.get_current_admin_user),
-    format: str = Query("json", regex="^(json|csv)$", description="Export format"),
-    type: str = Query("dashboard", regex="^(dashboard|performance|security|users)$", description="Data type to export"),
+    format: Literal["json", "csv"] = Query("json", description="Export format"),
+    type: Literal["dashboard", "performance", "security", "users"] = Query("dashboard", description="Data type to export"),
     days: int = Query(30, ge=1, le=365, description="Number of days to export")
 ):
     """Export analytics data (admin only)"""
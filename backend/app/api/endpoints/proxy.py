@@ -5,8 +5,9 @@ Created: 2025-05-29 12:49:36 UTC by Teeksss
 
 from typing import Any, Dict, List, Optional
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query, Body
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.orm import Session
+from pydantic import TypeAdapter
 import asyncio
 import json
 import io
@@ -23,6 +24,7 @@ from app.models.query import QueryExecution, QueryWhitelist
 from app.schemas.proxy import (
     QueryRequest,
     QueryResponse,
+    QueryHistoryItem,
     QueryHistoryResponse,
     ServerListResponse,
     QueryTemplateResponse,
@@ -43,6 +45,9 @@ from app.utils.exceptions import (
 
 router = APIRouter()
 
+# Built once; validates a whole history page in a single call
+_HISTORY_ITEMS_ADAPTER = TypeAdapter(List[QueryHistoryItem])
+
 
 @router.get("/servers", response_model=List[ServerListResponse])
 async def get_available_servers(
@@ -76,17 +81,19 @@ async def get_available_servers(
         
         server_list = []
         for server in servers:
-            server_data = ServerListResponse(
+            # model_construct skips validation: only for data read from the
+            # database or built by our own services, never for client input
+            server_data = ServerListResponse.model_construct(
                 id=server.id,
                 name=server.name,
                 description=server.description,
-                server_type=server.server_type,
+                server_type=server.server_type.value,
                 host=server.host,
                 port=server.port,
                 database=server.database,
-                environment=server.environment,
+                environment=server.environment.value,
                 is_read_only=server.is_read_only,
-                health_status=server.health_status,
+                health_status=server.health_status.value,
                 response_time_ms=server.response_time_ms,
                 last_health_check=server.last_health_check
             )
@@ -152,6 +159,10 @@ async def execute_query(
                 )
             ).first()
             
+            # Counted in the same UPDATE that checks max_executions
+            if approved_query and not QueryWhitelist.record_execution(db, approved_query.id):
+                raise UnauthorizedQueryError("Approved query has reached its execution limit")
+            
             if not approved_query:
                 whitelist_entry = QueryWhitelist(
                     query_hash=query_hash,
@@ -205,7 +216,7 @@ async def execute_query(
         
         db.commit()
         
-        return QueryResponse(
+        response = QueryResponse.model_construct(
             success=result.success,
             data=result.data,
             columns=result.columns,
@@ -214,6 +225,8 @@ async def execute_query(
             query_hash=analyzer.get_query_hash(query_request.query),
             error=result.error if not result.success else None
         )
+        # Result sets go straight to JSON bytes instead of via a dict copy
+        return Response(content=response.model_dump_json(), media_type="application/json")
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -259,8 +272,10 @@ async def get_query_history(
                 "rows_returned": execution.rows_returned
             })
         
-        return QueryHistoryResponse(
-            items=items,
+        # One core-validation call for the whole page; the wrapper's own
+        # fields are ours, so it is assembled without re-validating items
+        return QueryHistoryResponse.model_construct(
+            items=_HISTORY_ITEMS_ADAPTER.validate_python(items),
             total=total,
             skip=skip,
             limit=limit
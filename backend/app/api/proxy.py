@@ -5,11 +5,13 @@ Created: 2025-05-29 14:34:05 UTC by Teeksss
 
 from typing import Dict, List, Any, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Request, Query
-from sqlalchemy.orm import Session
+from fastapi.responses import Response
+from sqlalchemy.orm import Session, raiseload, selectinload, undefer_group
 
 from app.core import deps
+from app.core.config import settings
 from app.models.user import User
-from app.models.sql_server import SQLServerConnection
+from app.models.sql_server import SQLServerConnection, ServerIPWhitelist
 from app.models.query import QueryExecution, QueryStatus
 from app.schemas.query import (
     QueryRequest,
@@ -21,6 +23,7 @@ from app.schemas.query import (
 from app.services.sql_proxy import sql_proxy_service
 from app.services.rate_limiter import check_rate_limit
 from app.services.audit import audit_service
+from app.utils import get_trusted_client_ip
 
 router = APIRouter()
 
@@ -34,7 +37,12 @@ async def execute_query(
 ):
     """Execute SQL query"""
     
-    client_ip = request.client.host
+    # The direct peer is the reverse proxy in deployments behind nginx
+    client_ip = get_trusted_client_ip(
+        request.client.host if request.client else None,
+        request.headers,
+        settings.TRUSTED_PROXIES
+    )
     
     # Rate limiting
     rate_limit_result = await check_rate_limit(
@@ -63,6 +71,12 @@ async def execute_query(
             detail="Server not found or inactive"
         )
     
+    if not ServerIPWhitelist.allows(db, server.id, client_ip):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Client IP is not allowed to use this server"
+        )
+    
     try:
         # Execute query
         result = await sql_proxy_service.execute_query(
@@ -75,7 +89,13 @@ async def execute_query(
             use_cache=query_request.use_cache
         )
         
-        return QueryResponse(**result)
+        # model_construct skips validation: only for data built by our own
+        # services or read from the database, never for client input.
+        # Result sets go straight to JSON bytes instead of via a dict copy.
+        return Response(
+            content=QueryResponse.model_construct(**result).model_dump_json(),
+            media_type="application/json"
+        )
         
     except Exception as e:
         raise HTTPException(
@@ -95,7 +115,12 @@ async def get_query_history(
 ):
     """Get user query history"""
     
-    query = db.query(QueryExecution).filter(
+    # Only the server name is rendered; skip the other eager relationships
+    # and fail loudly if the listing ever starts lazy-loading per row
+    query = db.query(QueryExecution).options(
+        selectinload(QueryExecution.server),
+        raiseload("*")
+    ).filter(
         QueryExecution.user_id == current_user.id
     )
     
@@ -110,7 +135,7 @@ async def get_query_history(
     ).offset(offset).limit(limit).all()
     
     return [
-        QueryHistoryResponse(
+        QueryHistoryResponse.model_construct(
             id=execution.id,
             server_id=execution.server_id,
             server_name=execution.server.name if execution.server else "Unknown",
@@ -138,7 +163,9 @@ async def get_query_execution(
 ):
     """Get query execution details"""
     
-    execution = db.query(QueryExecution).filter(
+    execution = db.query(QueryExecution).options(
+        undefer_group("details")
+    ).filter(
         QueryExecution.id == execution_id,
         QueryExecution.user_id == current_user.id
     ).first()
@@ -0,0 +1,27 @@
+"""
+Request Clock - One "now" per request
+"""
+
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Optional
+
+# Set by RequestIdMiddleware at the start of each HTTP request
+_REQUEST_NOW: ContextVar[Optional[datetime]] = ContextVar("request_now", default=None)
+
+
+def request_now() -> datetime:
+    """Current request's start time (UTC), or the actual time outside a request"""
+    return _REQUEST_NOW.get() or datetime.now(timezone.utc)
+
+
+def set_request_now(now: Optional[datetime] = None):
+    """Pin "now" for the current context; returns a token for reset_request_now"""
+    return _REQUEST_NOW.set(now or datetime.now(timezone.utc))
+
+
+def reset_request_now(token) -> None:
+    _REQUEST_NOW.reset(token)
+
+
+__all__ = ["request_now", "set_request_now", "reset_request_now"]
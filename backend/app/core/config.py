@@ -109,8 +109,10 @@ class Settings(BaseSettings):
     # CORS Settings
     BACKEND_CORS_ORIGINS: List[str] = ["http://localhost:3000", "http://127.0.0.1:3000"]
     ALLOWED_HOSTS: List[str] = ["localhost", "127.0.0.1", "0.0.0.0"]
+    # Reverse proxies whose X-Forwarded-For is believed (addresses or CIDR ranges)
+    TRUSTED_PROXIES: List[str] = ["127.0.0.1", "::1"]
     
-    @validator("BACKEND_CORS_ORIGINS", pre=True)
+    @validator("BACKEND_CORS_ORIGINS", "TRUSTED_PROXIES", pre=True)
     def assemble_cors_origins(cls, v: Union[str, List[str]]) -> Union[List[str], str]:
         if isinstance(v, str) and not v.startswith("["):
             return [i.strip() for i in v.split(",")]
@@ -131,6 +133,7 @@ class Settings(BaseSettings):
     # =============================================================================
     AUDIT_LOG_ENABLED: bool = True
     AUDIT_RETENTION_DAYS: int = 365
+    AUDIT_QUEUE_MAX: int = 20000  # pending entries; overflow is dropped and counted
     LOG_LEVEL: str = "INFO"
     LOG_FORMAT: str = "detailed"
     
@@ -140,6 +143,7 @@ class Settings(BaseSettings):
     MONITORING_ENABLED: bool = True
     PROMETHEUS_ENABLED: bool = True
     HEALTH_CHECK_INTERVAL: int = 300
+    HEALTH_CACHE_TTL: int = 5  # seconds a service may reuse its health figures
     
     # =============================================================================
     # EMAIL SETTINGS
@@ -5,17 +5,24 @@ Created: 2025-05-29 13:54:25 UTC by Teeksss
 
 import logging
 from typing import Generator, Optional
-from sqlalchemy import create_engine, event, pool
+from sqlalchemy import create_engine, event, pool, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import QueuePool
 from contextlib import contextmanager
 import time
+import orjson
 
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+
+def _json_dumps(value) -> str:
+    """orjson-backed serializer for JSON/JSONB columns (stdlib-compatible keys)"""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
 # Create SQLAlchemy engine with connection pooling
 engine = create_engine(
     str(settings.DATABASE_URL),
@@ -28,6 +35,8 @@ engine = create_engine(
     echo=settings.DB_ECHO,
     echo_pool=settings.DEBUG,
     future=True,
+    json_serializer=_json_dumps,
+    json_deserializer=orjson.loads,
     connect_args={
         "connect_timeout": 30,
         "command_timeout": 60,
@@ -127,6 +136,8 @@ def create_all_tables():
     try:
         # Import all models to ensure they're registered
         from app.models import user, sql_server, query, notification
+        from sqlalchemy.orm import configure_mappers
+        configure_mappers()
         
         logger.info("Creating database tables...")
         Base.metadata.create_all(bind=engine)
@@ -137,6 +148,64 @@ def create_all_tables():
         raise
 
 
+# Tables range-partitioned by month in database/init/01_create_tables.sql
+PARTITIONED_LOG_TABLES = ("audit_logs",)
+
+
+def _is_partitioned(conn, table_name: str) -> bool:
+    """Tables created by create_all() instead of the init script are not partitioned"""
+    return conn.execute(
+        text(
+            "SELECT 1 FROM pg_partitioned_table p "
+            "JOIN pg_class c ON c.oid = p.partrelid WHERE c.relname = :name"
+        ),
+        {"name": table_name}
+    ).first() is not None
+
+
+def ensure_monthly_partitions(months_ahead: int = 3) -> int:
+    """Create upcoming monthly partitions for the partitioned log tables (PostgreSQL only)"""
+    if engine.dialect.name != "postgresql":
+        return 0
+    
+    ensured = 0
+    with engine.begin() as conn:
+        for table_name in PARTITIONED_LOG_TABLES:
+            if not _is_partitioned(conn, table_name):
+                continue
+            
+            conn.execute(
+                text("SELECT create_monthly_partitions(:name, :months_ahead)"),
+                {"name": table_name, "months_ahead": months_ahead}
+            )
+            ensured += 1
+    
+    return ensured
+
+
+def drop_expired_partitions(retention_days: int) -> int:
+    """Drop monthly log partitions older than the retention window (PostgreSQL only)
+
+    A retention of 0 or less means keep forever, so nothing is dropped.
+    """
+    if retention_days <= 0 or engine.dialect.name != "postgresql":
+        return 0
+    
+    dropped = 0
+    with engine.begin() as conn:
+        for table_name in PARTITIONED_LOG_TABLES:
+            if not _is_partitioned(conn, table_name):
+                continue
+            
+            # Dropping a whole month is instant, unlike a row-by-row DELETE
+            dropped += conn.execute(
+                text("SELECT drop_expired_partitions(:name, :retention_days)"),
+                {"name": table_name, "retention_days": retention_days}
+            ).scalar() or 0
+    
+    return dropped
+
+
 # Drop all tables (for testing)
 def drop_all_tables():
     """Drop all database tables"""
@@ -339,6 +408,8 @@ __all__ = [
     "get_db",
     "get_db_session",
     "create_all_tables",
+    "ensure_monthly_partitions",
+    "drop_expired_partitions",
     "drop_all_tables",
     "check_database_health",
     "get_database_version",
@@ -4,21 +4,25 @@ Created: 2025-05-30 08:16:16 UTC by Teeksss
 Version: 2.0.0 Final - PostgreSQL Focused, Production Ready
 """
 
+import asyncio
 import time
 import os
 import logging
 import sys
+from contextlib import asynccontextmanager
 from typing import Dict, Any, Optional
-from pathlib import Path
 
 from fastapi import FastAPI, Request, HTTPException, Depends, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
-from fastapi.responses import JSONResponse, HTMLResponse
+from fastapi.responses import JSONResponse, HTMLResponse, ORJSONResponse, Response
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
+import orjson
 import uvicorn
 
+from app.middleware.request_id_middleware import RequestIdMiddleware
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -85,8 +89,93 @@ APP_METADATA = {
     },
 }
 
+# Directories the application writes to at runtime
+RUNTIME_DIRECTORIES = ("logs", "uploads", "backups", "static", "temp")
+
+def _warm_db_pool() -> int:
+    """Open the pool's base connections so the first requests don't race to connect"""
+    from app.core.database import engine
+    
+    connections = []
+    try:
+        for _ in range(engine.pool.size()):
+            connections.append(engine.connect())
+    finally:
+        for connection in connections:
+            connection.close()
+    return len(connections)
+
+async def _init_db_pool():
+    """Warm the database pool without blocking startup if the database is down"""
+    try:
+        opened = await asyncio.to_thread(_warm_db_pool)
+        logger.info("🗄️ Database pool warmed: %d connections", opened)
+    except Exception as e:
+        logger.warning(f"Database pool warm-up skipped: {e}")
+
+def _configure_mappers() -> None:
+    """Resolve every model relationship now, so a mapping error fails startup instead of a request"""
+    from sqlalchemy.orm import configure_mappers
+    from app.models import notification, query, sql_server, user  # noqa: F401
+    
+    configure_mappers()
+
+async def _init_log_partitions():
+    """Ensure log partitions exist without blocking startup if the database is down
+
+    Expired partitions are dropped by the audit service's scheduled cleanup,
+    never at startup.
+    """
+    from app.core.database import ensure_monthly_partitions
+    
+    try:
+        ensured = await asyncio.to_thread(ensure_monthly_partitions)
+        if ensured:
+            logger.info("🗄️ Monthly log partitions verified: %d tables", ensured)
+    except Exception as e:
+        logger.warning(f"Log partition maintenance skipped: {e}")
+
+# Application lifespan
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup and shutdown"""
+    logger.info("🚀 Starting Enterprise SQL Proxy System v2.0.0")
+    logger.info("👤 Created by: Teeksss")
+    logger.info("📅 Build Date: 2025-05-30 08:16:16 UTC")
+    logger.info("🌍 Environment: %s", os.getenv("ENVIRONMENT", "development"))
+    logger.info("🐍 Python Version: %s", f"{sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}")
+    logger.info("⚡ FastAPI Version: 0.104.1")
+    logger.info("🗄️ Database Focus: PostgreSQL & MySQL")
+    logger.info("🏢 Enterprise Grade: Production Ready")
+    
+    _configure_mappers()
+    
+    # Create necessary directories, warm the database pool, roll log
+    # partitions forward and probe the database drivers concurrently
+    await asyncio.gather(
+        *(asyncio.to_thread(os.makedirs, directory, exist_ok=True) for directory in RUNTIME_DIRECTORIES),
+        _init_db_pool(),
+        _init_log_partitions(),
+        asyncio.to_thread(_get_drivers_body_template),
+    )
+    logger.info("📁 Directories created/verified: %s", ", ".join(RUNTIME_DIRECTORIES))
+    
+    # Build the OpenAPI schema now rather than on the first /docs hit
+    app.openapi()
+    
+    logger.info("✅ Application startup completed successfully")
+    
+    yield
+    
+    logger.info("🛑 Shutting down Enterprise SQL Proxy System v2.0.0")
+    logger.info("👤 Created by: Teeksss")
+    logger.info("✅ Application shutdown completed successfully")
+
 # Create FastAPI application
 app = FastAPI(
+    lifespan=lifespan,
+    # Routers that return plain dicts/lists are encoded by orjson
+    default_response_class=ORJSONResponse,
     title=APP_METADATA["title"],
     description=APP_METADATA["description"],
     version=APP_METADATA["version"],
@@ -103,6 +192,18 @@ app = FastAPI(
     }
 )
 
+# Request headers sent by the frontend API clients. A fixed list lets
+# CORSMiddleware answer preflights with its precomputed header value
+# instead of echoing Access-Control-Request-Headers back.
+CORS_ALLOW_HEADERS = [
+    "Authorization",
+    "Content-Type",
+    "X-Request-ID",
+    "X-Request-Time",
+    "X-Client-Version",
+    "X-Client-Platform",
+]
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -116,85 +217,62 @@ app.add_middleware(
     ],
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH"],
-    allow_headers=["*"],
+    allow_headers=CORS_ALLOW_HEADERS,
     expose_headers=["X-Request-ID", "X-Response-Time", "X-API-Version"],
+    max_age=3600,
 )
 
-# Compression middleware
-app.add_middleware(GZipMiddleware, minimum_size=1000)
+# Compression middleware. Nginx compresses proxied responses from 1KB
+# (gzip_min_length 1024), so only large payloads are compressed here.
+app.add_middleware(GZipMiddleware, minimum_size=4096)
 
-# Request ID middleware
-@app.middleware("http")
-async def add_request_id(request: Request, call_next):
-    """Add request ID and response time to headers"""
-    start_time = time.time()
-    request_id = f"req_{int(time.time())}_{hash(str(request.url)) % 10000}"
-    
-    response = await call_next(request)
-    
-    process_time = time.time() - start_time
-    response.headers["X-Request-ID"] = request_id
-    response.headers["X-Response-Time"] = f"{process_time:.4f}s"
-    response.headers["X-API-Version"] = "2.0.0"
-    response.headers["X-Creator"] = "Teeksss"
-    
-    return response
+# Request ID middleware (skips /health and the docs routes)
+app.add_middleware(RequestIdMiddleware, api_version="2.0.0", creator="Teeksss")
 
 # Global exception handlers
+# Error bodies are spliced into a pre-built template so only the dynamic
+# fields are serialized per error.
+_ERROR_BODY_TEMPLATE = (
+    b'{"error":true,"status_code":%d,"message":%s,%s"timestamp":%f,'
+    b'"path":%s,"method":%s,"version":"2.0.0","creator":"Teeksss"}'
+)
+
+def _error_response(status_code: int, message: Any, path: str, method: str, details: Any = None) -> Response:
+    """Build a JSON error response from the pre-built template"""
+    details_field = b'"details":' + orjson.dumps(details, default=str) + b',' if details is not None else b''
+    body = _ERROR_BODY_TEMPLATE % (
+        status_code,
+        orjson.dumps(message, default=str),
+        details_field,
+        time.time(),
+        orjson.dumps(path),
+        orjson.dumps(method),
+    )
+    return Response(content=body, status_code=status_code, media_type="application/json")
+
 @app.exception_handler(StarletteHTTPException)
 async def http_exception_handler(request: Request, exc: StarletteHTTPException):
     """Handle HTTP exceptions"""
-    logger.error(f"HTTP Exception: {exc.status_code} - {exc.detail} - Path: {request.url.path}")
-    return JSONResponse(
-        status_code=exc.status_code,
-        content={
-            "error": True,
-            "status_code": exc.status_code,
-            "message": exc.detail,
-            "timestamp": time.time(),
-            "path": str(request.url.path),
-            "method": request.method,
-            "version": "2.0.0",
-            "creator": "Teeksss"
-        },
-    )
+    path = request.scope["path"]
+    method = request.scope["method"]
+    logger.error(f"HTTP Exception: {exc.status_code} - {exc.detail} - Path: {path}")
+    return _error_response(exc.status_code, exc.detail, path, method)
 
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """Handle validation exceptions"""
-    logger.error(f"Validation Error: {exc} - Path: {request.url.path}")
-    return JSONResponse(
-        status_code=422,
-        content={
-            "error": True,
-            "status_code": 422,
-            "message": "Validation error",
-            "details": exc.errors(),
-            "timestamp": time.time(),
-            "path": str(request.url.path),
-            "method": request.method,
-            "version": "2.0.0",
-            "creator": "Teeksss"
-        },
-    )
+    path = request.scope["path"]
+    method = request.scope["method"]
+    logger.error(f"Validation Error: {exc} - Path: {path}")
+    return _error_response(422, "Validation error", path, method, details=exc.errors())
 
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
     """Handle general exceptions"""
-    logger.error(f"Unhandled Exception: {exc} - Path: {request.url.path}", exc_info=True)
-    return JSONResponse(
-        status_code=500,
-        content={
-            "error": True,
-            "status_code": 500,
-            "message": "Internal server error",
-            "timestamp": time.time(),
-            "path": str(request.url.path),
-            "method": request.method,
-            "version": "2.0.0",
-            "creator": "Teeksss"
-        },
-    )
+    path = request.scope["path"]
+    method = request.scope["method"]
+    logger.error(f"Unhandled Exception: {exc} - Path: {path}", exc_info=True)
+    return _error_response(500, "Internal server error", path, method)
 
 # Database connection check
 def check_database_connections():
@@ -215,7 +293,7 @@ def check_database_connections():
     return connections
 
 # Root endpoint
-@app.get("/", tags=["Root"])
+@app.get("/", tags=["Root"], response_class=ORJSONResponse, response_model=None)
 async def root():
     """Root endpoint with comprehensive system information"""
     return {
@@ -264,7 +342,7 @@ async def root():
     }
 
 # Health check endpoint
-@app.get("/health", tags=["Health"])
+@app.get("/health", tags=["Health"], response_class=ORJSONResponse, response_model=None)
 async def health_check():
     """Comprehensive health check endpoint"""
     db_connections = check_database_connections()
@@ -298,7 +376,7 @@ async def health_check():
     }
 
 # API v1 info endpoint
-@app.get("/api/v1/info", tags=["API Info"])
+@app.get("/api/v1/info", tags=["API Info"], response_class=ORJSONResponse, response_model=None)
 async def api_info():
     """Detailed API information endpoint"""
     return {
@@ -345,7 +423,7 @@ async def api_info():
     }
 
 # System status endpoint
-@app.get("/system", tags=["System"])
+@app.get("/system", tags=["System"], response_class=ORJSONResponse, response_model=None)
 async def system_status():
     """Detailed system status endpoint"""
     return {
@@ -381,9 +459,13 @@ async def system_status():
     }
 
 # Database drivers test endpoint
-@app.get("/drivers", tags=["Database"])
-async def database_drivers():
-    """Test database drivers availability"""
+# Driver availability cannot change while the process runs, so the payload is
+# probed once and kept as a serialized template; only the timestamp is
+# filled in per request.
+_drivers_body_template: Optional[bytes] = None
+
+def _build_drivers_body_template() -> bytes:
+    """Probe database drivers and pre-serialize the /drivers payload"""
     drivers = {
         "postgresql": {"status": "unknown", "driver": "psycopg2-binary", "description": "Primary database"},
         "mysql": {"status": "unknown", "driver": "PyMySQL", "description": "Secondary database"},
@@ -420,9 +502,7 @@ async def database_drivers():
         drivers["redis"]["status"] = "not_installed"
         drivers["redis"]["error"] = str(e)
     
-    return {
-        "drivers": drivers,
-        "timestamp": time.time(),
+    static_fields = orjson.dumps({
         "creator": "Teeksss",
         "version": "2.0.0",
         "focus": "PostgreSQL & MySQL Enterprise Support",
@@ -432,10 +512,26 @@ async def database_drivers():
             "failover": "available",
             "monitoring": "comprehensive"
         }
-    }
+    })
+    return (
+        b'{"drivers":' + orjson.dumps(drivers).replace(b"%", b"%%")
+        + b',"timestamp":%f,' + static_fields[1:].replace(b"%", b"%%")
+    )
+
+def _get_drivers_body_template() -> bytes:
+    """Return the /drivers template, probing drivers on first use"""
+    global _drivers_body_template
+    if _drivers_body_template is None:
+        _drivers_body_template = _build_drivers_body_template()
+    return _drivers_body_template
+
+@app.get("/drivers", tags=["Database"], response_class=ORJSONResponse, response_model=None)
+async def database_drivers():
+    """Test database drivers availability"""
+    return Response(content=_get_drivers_body_template() % time.time(), media_type="application/json")
 
 # Status page endpoint
-@app.get("/status", tags=["System"])
+@app.get("/status", tags=["System"], response_class=ORJSONResponse, response_model=None)
 async def status_page():
     """System status page with detailed information"""
     return {
@@ -467,7 +563,7 @@ async def status_page():
     }
 
 # Version endpoint
-@app.get("/version", tags=["System"])
+@app.get("/version", tags=["System"], response_class=ORJSONResponse, response_model=None)
 async def version_info():
     """Version information endpoint"""
     return {
@@ -496,7 +592,7 @@ async def version_info():
     }
 
 # Documentation redirect
-@app.get("/documentation", tags=["Documentation"])
+@app.get("/documentation", tags=["Documentation"], response_class=ORJSONResponse, response_model=None)
 async def documentation_redirect():
     """Redirect to main documentation"""
     return {
@@ -516,36 +612,10 @@ async def documentation_redirect():
         }
     }
 
-# Startup event
-@app.on_event("startup")
-async def startup_event():
-    """Application startup event"""
-    logger.info("🚀 Starting Enterprise SQL Proxy System v2.0.0")
-    logger.info("👤 Created by: Teeksss")
-    logger.info("📅 Build Date: 2025-05-30 08:16:16 UTC")
-    logger.info("🌍 Environment: %s", os.getenv("ENVIRONMENT", "development"))
-    logger.info("🐍 Python Version: %s", f"{sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}")
-    logger.info("⚡ FastAPI Version: 0.104.1")
-    logger.info("🗄️ Database Focus: PostgreSQL & MySQL")
-    logger.info("🏢 Enterprise Grade: Production Ready")
-    
-    # Create necessary directories
-    for directory in ["logs", "uploads", "backups", "static", "temp"]:
-        Path(directory).mkdir(exist_ok=True)
-        logger.info(f"📁 Directory created/verified: {directory}")
-    
-    logger.info("✅ Application startup completed successfully")
-
-# Shutdown event
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Application shutdown event"""
-    logger.info("🛑 Shutting down Enterprise SQL Proxy System v2.0.0")
-    logger.info("👤 Created by: Teeksss")
-    logger.info("✅ Application shutdown completed successfully")
-
 # Main entry point
 if __name__ == "__main__":
+    # uvloop and httptools ship with uvicorn[standard]. uvicorn ignores
+    # WORKERS while RELOAD is on, so only production config raises it.
     uvicorn.run(
         "app.main:app",
         host=os.getenv("HOST", "0.0.0.0"),
@@ -553,5 +623,9 @@ if __name__ == "__main__":
         reload=os.getenv("RELOAD", "true").lower() == "true",
         log_level=os.getenv("LOG_LEVEL", "info").lower(),
         workers=int(os.getenv("WORKERS", 1)),
+        loop="uvloop",
+        http="httptools",
+        backlog=int(os.getenv("BACKLOG", 2048)),
+        timeout_keep_alive=int(os.getenv("TIMEOUT_KEEP_ALIVE", 30)),
         access_log=True
     )
\ No newline at end of file
@@ -5,20 +5,22 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Paths that never require authentication
+_EXCLUDED_PATHS = frozenset(("/", "/docs", "/redoc", "/openapi.json", "/health", "/api/auth/login"))
+_API_PREFIX = "/api/"
+
 class AuthMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app):
-        super().__init__(app)
-        self.excluded_paths = ["/", "/docs", "/redoc", "/openapi.json", "/health", "/api/auth/login"]
-    
     async def dispatch(self, request: Request, call_next):
+        path = request.scope["path"]
+        
         # Skip authentication for excluded paths
-        if request.url.path in self.excluded_paths:
+        if path in _EXCLUDED_PATHS:
             return await call_next(request)
         
         # Check for Authorization header
         auth_header = request.headers.get("authorization")
         if not auth_header or not auth_header.startswith("Bearer "):
-            if request.url.path.startswith("/api/"):
+            if path.startswith(_API_PREFIX):
                 return JSONResponse(
                     status_code=401,
                     content={"detail": "Authentication required"}
@@ -5,14 +5,13 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Paths that are never rate limited
+_EXCLUDED_PATHS = frozenset(("/", "/docs", "/redoc", "/openapi.json", "/health"))
+
 class RateLimitMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app):
-        super().__init__(app)
-        self.excluded_paths = ["/", "/docs", "/redoc", "/openapi.json", "/health"]
-    
     async def dispatch(self, request: Request, call_next):
         # Skip rate limiting for excluded paths
-        if request.url.path in self.excluded_paths:
+        if request.scope["path"] in _EXCLUDED_PATHS:
             return await call_next(request)
         
         # Rate limiting is handled in individual endpoints
@@ -0,0 +1,53 @@
+"""
+Request ID Middleware - request IDs, timing headers and the per-request clock
+"""
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+import os
+import time
+
+from app.core.clock import reset_request_now, set_request_now
+
+# Paths where request ID and timing headers are not worth computing
+# (probe traffic and API documentation)
+_SKIP_HEADERS = frozenset(("/health", "/openapi.json", "/docs", "/redoc"))
+
+def _new_request_id() -> str:
+    """Return a UUIDv7 request ID (48-bit ms timestamp + random), time-sortable and globally unique"""
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), "big")
+    value = value & ~(0xF << 76) | (0x7 << 76)  # version 7
+    value = value & ~(0x3 << 62) | (0x2 << 62)  # RFC 4122 variant
+    return f"req_{value:032x}"
+
+class RequestIdMiddleware:
+    """Add request ID and response time headers (pure ASGI, no Request object)"""
+
+    def __init__(self, app: ASGIApp, api_version: str = "2.0.0", creator: str = "Teeksss"):
+        self.app = app
+        self.api_version = api_version
+        self.creator = creator
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["path"] in _SKIP_HEADERS:
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.time()
+        request_id = _new_request_id()
+
+        async def send_with_headers(message: Message):
+            if message["type"] == "http.response.start":
+                process_time = time.time() - start_time
+                headers = MutableHeaders(scope=message)
+                headers["X-Request-ID"] = request_id
+                headers["X-Response-Time"] = f"{process_time:.4f}s"
+                headers["X-API-Version"] = self.api_version
+                headers["X-Creator"] = self.creator
+            await send(message)
+
+        now_token = set_request_now()
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            reset_request_now(now_token)
@@ -6,116 +6,120 @@ This module contains all database models for the Enterprise SQL Proxy System
 including User, SQLServer, Query, and Notification models.
 """
 
-# Import all models
-from app.models.user import (
-    User,
-    UserRole,
-    UserStatus,
-    UserSession,
-    ServerPermission,
-    AuditLog
-)
-from app.models.sql_server import (
-    SQLServerConnection,
-    ServerType,
-    Environment,
-    HealthStatus,
-    ConnectionStatus,
-    ServerHealthCheck,
-    ServerPerformanceMetric,
-    ServerConfiguration,
-    ServerTag
-)
-from app.models.query import (
-    QueryExecution,
-    QueryStatus,
-    QueryType,
-    RiskLevel,
-    QueryApproval,
-    ApprovalStatus,
-    QueryWhitelist,
-    QueryTemplate,
-    QueryExport,
-    QuerySchedule
-)
-from app.models.notification import (
-    NotificationRule,
-    NotificationDelivery,
-    NotificationTemplate,
-    NotificationPreference,
-    NotificationStatus,
-    NotificationChannel,
-    NotificationPriority
-)
-
-# Import base
-from app.core.database import Base
+import importlib
+from collections.abc import Mapping
+from functools import lru_cache
 
 # Module metadata
 __version__ = "2.0.0"
 __author__ = "Teeksss"
 __description__ = "Database models for Enterprise SQL Proxy System"
 
-# Model registry for easy access
-MODEL_REGISTRY = {
+# Model name -> defining module. Submodules are imported on first access
+# (PEP 562) so importing this package does not pull in every mapper.
+_MODEL_MODULES = {
     # User models
-    "User": User,
-    "UserSession": UserSession,
-    "ServerPermission": ServerPermission,
-    "AuditLog": AuditLog,
+    "User": "app.models.user",
+    "UserSession": "app.models.user",
+    "ServerPermission": "app.models.user",
+    "AuditLog": "app.models.audit",
     
     # Server models
-    "SQLServerConnection": SQLServerConnection,
-    "ServerHealthCheck": ServerHealthCheck,
-    "ServerPerformanceMetric": ServerPerformanceMetric,
-    "ServerConfiguration": ServerConfiguration,
-    "ServerTag": ServerTag,
+    "SQLServerConnection": "app.models.sql_server",
+    "ServerHealthCheck": "app.models.sql_server",
+    "ServerPerformanceMetric": "app.models.sql_server",
+    "ServerConfiguration": "app.models.sql_server",
+    "ServerTag": "app.models.sql_server",
+    "ServerHealthHistory": "app.models.sql_server",
+    "ServerIPWhitelist": "app.models.sql_server",
     
     # Query models
-    "QueryExecution": QueryExecution,
-    "QueryApproval": QueryApproval,
-    "QueryWhitelist": QueryWhitelist,
-    "QueryTemplate": QueryTemplate,
-    "QueryExport": QueryExport,
-    "QuerySchedule": QuerySchedule,
+    "QueryExecution": "app.models.query",
+    "QueryApproval": "app.models.query",
+    "QueryWhitelist": "app.models.query",
+    "QueryTemplate": "app.models.query",
+    "QueryExport": "app.models.query",
+    "QuerySchedule": "app.models.query",
     
     # Notification models
-    "NotificationRule": NotificationRule,
-    "NotificationDelivery": NotificationDelivery,
-    "NotificationTemplate": NotificationTemplate,
-    "NotificationPreference": NotificationPreference
+    "NotificationRule": "app.models.notification",
+    "NotificationDelivery": "app.models.notification",
+    "NotificationTemplate": "app.models.notification",
+    "NotificationPreference": "app.models.notification"
 }
 
-# Enum registry
-ENUM_REGISTRY = {
+# Enum name -> defining module
+_ENUM_MODULES = {
     # User enums
-    "UserRole": UserRole,
-    "UserStatus": UserStatus,
+    "UserRole": "app.models.enums",
+    "UserStatus": "app.models.enums",
     
     # Server enums
-    "ServerType": ServerType,
-    "Environment": Environment,
-    "HealthStatus": HealthStatus,
-    "ConnectionStatus": ConnectionStatus,
+    "ServerType": "app.models.enums",
+    "Environment": "app.models.enums",
+    "HealthStatus": "app.models.enums",
+    "ConnectionStatus": "app.models.enums",
     
     # Query enums
-    "QueryStatus": QueryStatus,
-    "QueryType": QueryType,
-    "RiskLevel": RiskLevel,
-    "ApprovalStatus": ApprovalStatus,
+    "QueryStatus": "app.models.enums",
+    "QueryType": "app.models.enums",
+    "RiskLevel": "app.models.enums",
+    "ApprovalStatus": "app.models.enums",
     
     # Notification enums
-    "NotificationStatus": NotificationStatus,
-    "NotificationChannel": NotificationChannel,
-    "NotificationPriority": NotificationPriority
+    "NotificationStatus": "app.models.notification",
+    "NotificationChannel": "app.models.notification",
+    "NotificationPriority": "app.models.notification"
 }
 
+_LAZY_MAP = {
+    **_MODEL_MODULES,
+    **_ENUM_MODULES,
+    "Base": "app.core.database"
+}
+
+
+def __getattr__(name: str):
+    """Import models, enums and Base on first access"""
+    module_name = _LAZY_MAP.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+class _LazyRegistry(Mapping):
+    """Read-only name -> class registry that resolves entries on access"""
+    
+    def __init__(self, names):
+        self._names = tuple(names)
+    
+    def __getitem__(self, name):
+        if name not in self._names:
+            raise KeyError(name)
+        return __getattr__(name)
+    
+    def __iter__(self):
+        return iter(self._names)
+    
+    def __len__(self):
+        return len(self._names)
+
+
+# Model registry for easy access
+MODEL_REGISTRY = _LazyRegistry(_MODEL_MODULES)
+
+# Enum registry
+ENUM_REGISTRY = _LazyRegistry(_ENUM_MODULES)
+
 # Model metadata
 MODEL_METADATA = {
     "total_models": len(MODEL_REGISTRY),
     "total_enums": len(ENUM_REGISTRY),
     "user_models": 4,
-    "server_models": 5,
+    "server_models": 7,
     "query_models": 6,
     "notification_models": 4,
     "created_by": __author__,
@@ -163,8 +167,9 @@ def validate_models():
     except Exception as e:
         return False, str(e)
 
+@lru_cache(maxsize=1)
 def get_model_info():
-    """Get detailed information about all models"""
+    """Get detailed information about all models (computed once, do not mutate)"""
     info = {
         "metadata": MODEL_METADATA,
         "models": {},
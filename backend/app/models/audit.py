@@ -1,14 +1,37 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, ForeignKey, JSON, Index, Enum
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
-import json
+from enum import Enum as PyEnum
 
 from app.core.database import Base
+from app.models.types import BigIntegerType, JSONBType, PreserializedJSONBType, enum_values
+
+class AuditStatus(str, PyEnum):
+    """Audit action outcomes"""
+    SUCCESS = "success"
+    ERROR = "error"
+    FAILED = "failed"
+    BLOCKED = "blocked"
+    TIMEOUT = "timeout"
+    PARTIAL = "partial"
+
+class SecuritySeverity(str, PyEnum):
+    """Security event severities"""
+    LOW = "low"
+    MEDIUM = "medium"
+    HIGH = "high"
+    CRITICAL = "critical"
+
+class ChangeOperation(str, PyEnum):
+    """Data change operations"""
+    INSERT = "INSERT"
+    UPDATE = "UPDATE"
+    DELETE = "DELETE"
 
 class AuditLog(Base):
     __tablename__ = "audit_logs"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(BigIntegerType, primary_key=True, index=True)
     
     # User context
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -27,33 +50,40 @@ class AuditLog(Base):
     request_id = Column(String)
     
     # Action details
-    details = Column(Text)  # JSON with action-specific details
-    old_values = Column(Text)  # JSON with previous values (for updates)
-    new_values = Column(Text)  # JSON with new values (for updates)
+    details = Column(PreserializedJSONBType)  # Action-specific details; AuditService binds JSON text
+    old_values = Column(JSONBType)  # Previous values (for updates)
+    new_values = Column(JSONBType)  # New values (for updates)
     
     # Result
-    status = Column(String, nullable=False)  # success, error, blocked, timeout
+    status = Column(Enum(AuditStatus, name="audit_status", values_callable=enum_values, create_constraint=True, validate_strings=True), nullable=False)
     error_message = Column(Text)
     
     # Performance
     duration_ms = Column(Integer)
     
+    # Security scoring, filled in by AuditService
+    severity = Column(String(20), default="info")
+    category = Column(String(50))
+    risk_score = Column(Integer, default=0)
+    is_suspicious = Column(Boolean, default=False)
+    alert_triggered = Column(Boolean, default=False)
+    
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
-    user = relationship("User")
-    
-    def set_details(self, details_dict: dict):
-        """Set details as JSON string"""
-        self.details = json.dumps(details_dict) if details_dict else None
-    
-    def get_details(self) -> dict:
-        """Get details as dictionary"""
-        try:
-            return json.loads(self.details) if self.details else {}
-        except json.JSONDecodeError:
-            return {}
+    user = relationship("User", back_populates="audit_logs")
+    
+    # Indexes for per-user and per-action audit timelines, plus a GIN index
+    # for key/containment filters on details. On PostgreSQL the init script
+    # range-partitions this table by month on created_at; the BRIN index
+    # covers time-window scans at a fraction of a B-tree's size.
+    __table_args__ = (
+        Index("ix_audit_user_created", "user_id", "created_at"),
+        Index("ix_audit_action_created", "action", "created_at"),
+        Index("ix_audit_details_gin", "details", postgresql_using="gin"),
+        Index("ix_audit_created_brin", "created_at", postgresql_using="brin", postgresql_with={"pages_per_range": 32}),
+    )
 
 class SecurityEvent(Base):
     __tablename__ = "security_events"
@@ -62,7 +92,7 @@ class SecurityEvent(Base):
     
     # Event classification
     event_type = Column(String, nullable=False)  # failed_login, suspicious_query, rate_limit_exceeded
-    severity = Column(String, nullable=False)  # low, medium, high, critical
+    severity = Column(Enum(SecuritySeverity, name="security_severity", values_callable=enum_values, create_constraint=True, validate_strings=True), nullable=False)
     
     # Source information
     source_ip = Column(String)
@@ -71,14 +101,14 @@ class SecurityEvent(Base):
     
     # Event details
     description = Column(Text, nullable=False)
-    details = Column(Text)  # JSON with event-specific details
+    details = Column(JSONBType)  # Event-specific details
     
     # Detection information
     detection_method = Column(String)  # rule_based, anomaly, manual
     rule_name = Column(String)
     
     # Response actions
-    actions_taken = Column(Text)  # JSON array of response actions
+    actions_taken = Column(JSONBType)  # List of response actions
     is_false_positive = Column(Boolean, default=False)
     
     # Status
@@ -91,6 +121,12 @@ class SecurityEvent(Base):
     
     # Relationships
     user = relationship("User")
+    
+    # Indexes for the security dashboard filters
+    __table_args__ = (
+        Index("ix_secevent_severity_occurred", "severity", "occurred_at"),
+        Index("ix_secevent_type_occurred", "event_type", "occurred_at"),
+    )
 
 class ChangeLog(Base):
     __tablename__ = "change_logs"
@@ -100,12 +136,12 @@ class ChangeLog(Base):
     # Change identification
     table_name = Column(String, nullable=False)
     record_id = Column(String, nullable=False)
-    operation = Column(String, nullable=False)  # INSERT, UPDATE, DELETE
+    operation = Column(Enum(ChangeOperation, name="change_operation", values_callable=enum_values, create_constraint=True, validate_strings=True), nullable=False)
     
     # Change details
-    old_values = Column(Text)  # JSON
-    new_values = Column(Text)  # JSON
-    changed_fields = Column(Text)  # JSON array of changed field names
+    old_values = Column(JSONBType)
+    new_values = Column(JSONBType)
+    changed_fields = Column(JSONBType)  # List of changed field names
     
     # Context
     changed_by = Column(String, nullable=False)
@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, Enum, Float
+from sqlalchemy import Column, Integer, SmallInteger, String, DateTime, Boolean, Text, Enum, Float
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.sql import func
-from enum import Enum as PyEnum
-import json
+from enum import Enum as PyEnum, IntFlag
+import orjson
 
 from app.core.database import Base
 
@@ -28,6 +29,41 @@ class ConfigType(PyEnum):
     URL = "url"
     EMAIL = "email"
 
+class ConfigFlags(IntFlag):
+    """Configuration behavior flags, packed into SystemConfig.flags"""
+    SENSITIVE = 1         # Encrypt in database
+    REQUIRES_RESTART = 2
+    READONLY = 4
+    ADVANCED = 8          # Hide from basic UI
+
+_TRUE_VALUES = frozenset(('true', '1', 'yes', 'on'))
+
+def _identity(value):
+    """Return value unchanged (string-like config types)"""
+    return value
+
+# Text -> typed value parser per config type; anything else stays a string
+_VALUE_PARSERS = {
+    ConfigType.INTEGER: int,
+    ConfigType.FLOAT: float,
+    ConfigType.BOOLEAN: lambda value: value.lower() in _TRUE_VALUES,
+    ConfigType.JSON: orjson.loads,
+}
+
+def _flag_property(flag: ConfigFlags) -> hybrid_property:
+    """Boolean attribute backed by one bit of the flags column"""
+    def fget(self):
+        return bool((self.flags or 0) & flag)
+    
+    def fset(self, value):
+        flags = self.flags or 0
+        self.flags = flags | flag if value else flags & ~int(flag)
+    
+    def expr(cls):
+        return cls.flags.op("&")(int(flag)) != 0
+    
+    return hybrid_property(fget, fset, expr=expr)
+
 class SystemConfig(Base):
     __tablename__ = "system_configs"
     
@@ -48,11 +84,12 @@ class SystemConfig(Base):
     max_value = Column(Float)
     allowed_values = Column(Text)  # JSON array
     
-    # Behavior
-    is_sensitive = Column(Boolean, default=False)  # Encrypt in database
-    requires_restart = Column(Boolean, default=False)
-    is_readonly = Column(Boolean, default=False)
-    is_advanced = Column(Boolean, default=False)  # Hide from basic UI
+    # Behavior (ConfigFlags bits, exposed as the boolean attributes below)
+    flags = Column(SmallInteger, default=0, nullable=False)
+    is_sensitive = _flag_property(ConfigFlags.SENSITIVE)
+    requires_restart = _flag_property(ConfigFlags.REQUIRES_RESTART)
+    is_readonly = _flag_property(ConfigFlags.READONLY)
+    is_advanced = _flag_property(ConfigFlags.ADVANCED)
     
     # UI properties
     display_order = Column(Integer, default=0)
@@ -61,45 +98,91 @@ class SystemConfig(Base):
     
     # Change tracking
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     updated_by = Column(String)
     
     def get_typed_value(self):
-        """Get value converted to appropriate type"""
+        """Get value converted to appropriate type
+        
+        Scalars are memoized until the row changes. JSON values are parsed on
+        every call, so each caller gets its own dict or list to mutate.
+        """
+        if self.config_type == ConfigType.JSON:
+            return self._convert_value()
+        
+        cache_key = (self.config_type, self.value, self.default_value)
+        cached = self.__dict__.get("_typed_value_cache")
+        if cached is not None and cached[0] == cache_key:
+            return cached[1]
+        
+        typed_value = self._convert_value()
+        self._typed_value_cache = (cache_key, typed_value)
+        return typed_value
+    
+    def get_typed_default(self):
+        """Get default value converted to appropriate type (memoized like get_typed_value)"""
+        if self.config_type == ConfigType.JSON:
+            return self._convert_default()
+        
+        cache_key = (self.config_type, self.default_value)
+        cached = self.__dict__.get("_typed_default_cache")
+        if cached is not None and cached[0] == cache_key:
+            return cached[1]
+        
+        typed_default = self._convert_default()
+        self._typed_default_cache = (cache_key, typed_default)
+        return typed_default
+    
+    @property
+    def allowed_values_set(self):
+        """allowed_values parsed once for membership checks (None if unrestricted)
+        
+        A frozenset when every allowed value is hashable; a tuple when some are
+        JSON arrays or objects.
+        """
+        cached = self.__dict__.get("_allowed_values_cache")
+        if cached is not None and cached[0] == self.allowed_values:
+            return cached[1]
+        
+        allowed = None
+        if self.allowed_values:
+            parsed = orjson.loads(self.allowed_values)
+            try:
+                allowed = frozenset(parsed)
+            except TypeError:
+                allowed = tuple(parsed)
+        self._allowed_values_cache = (self.allowed_values, allowed)
+        return allowed
+    
+    def is_allowed_value(self, value) -> bool:
+        """Check value against allowed_values (True if unrestricted)"""
+        allowed = self.allowed_values_set
+        if allowed is None:
+            return True
+        try:
+            return value in allowed
+        except TypeError:
+            # Unhashable value (a parsed JSON array or object) against a frozenset
+            return False
+    
+    def _convert_value(self):
+        """Convert value to the configured type"""
         if not self.value:
             return self.get_typed_default()
         
         try:
-            if self.config_type == ConfigType.INTEGER:
-                return int(self.value)
-            elif self.config_type == ConfigType.FLOAT:
-                return float(self.value)
-            elif self.config_type == ConfigType.BOOLEAN:
-                return self.value.lower() in ('true', '1', 'yes', 'on')
-            elif self.config_type == ConfigType.JSON:
-                return json.loads(self.value)
-            else:
-                return self.value
-        except (ValueError, json.JSONDecodeError):
+            return _VALUE_PARSERS.get(self.config_type, _identity)(self.value)
+        except (ValueError, orjson.JSONDecodeError):
             return self.get_typed_default()
     
-    def get_typed_default(self):
-        """Get default value converted to appropriate type"""
+    def _convert_default(self):
+        """Convert default value to the configured type"""
         if not self.default_value:
             return None
         
         try:
-            if self.config_type == ConfigType.INTEGER:
-                return int(self.default_value)
-            elif self.config_type == ConfigType.FLOAT:
-                return float(self.default_value)
-            elif self.config_type == ConfigType.BOOLEAN:
-                return self.default_value.lower() in ('true', '1', 'yes', 'on')
-            elif self.config_type == ConfigType.JSON:
-                return json.loads(self.default_value)
-            else:
-                return self.default_value
-        except (ValueError, json.JSONDecodeError):
+            return _VALUE_PARSERS.get(self.config_type, _identity)(self.default_value)
+        except (ValueError, orjson.JSONDecodeError):
             return None
 
 class ConfigHistory(Base):
@@ -137,4 +220,4 @@ class SystemTheme(Base):
     custom_css = Column(Text)
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
\ No newline at end of file
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
\ No newline at end of file
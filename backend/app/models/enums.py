@@ -0,0 +1,87 @@
+"""
+Model Enums - Kept apart from the mapped classes
+
+Schemas and services can import these without loading SQLAlchemy or
+creating the database engine; the model modules re-export them.
+"""
+
+import enum
+
+
+class UserRole(enum.Enum):
+    ADMIN = "admin"
+    ANALYST = "analyst"
+    POWERBI = "powerbi"
+    READONLY = "readonly"
+
+
+class UserStatus(enum.Enum):
+    ACTIVE = "active"
+    INACTIVE = "inactive"
+    SUSPENDED = "suspended"
+    PENDING = "pending"
+
+
+class ServerType(enum.Enum):
+    MSSQL = "mssql"
+    POSTGRESQL = "postgresql"
+    MYSQL = "mysql"
+    ORACLE = "oracle"
+    SQLITE = "sqlite"
+
+
+class Environment(enum.Enum):
+    PRODUCTION = "production"
+    STAGING = "staging"
+    DEVELOPMENT = "development"
+    TEST = "test"
+
+
+class HealthStatus(enum.Enum):
+    HEALTHY = "healthy"
+    DEGRADED = "degraded"
+    UNHEALTHY = "unhealthy"
+    UNKNOWN = "unknown"
+
+
+class ConnectionStatus(enum.Enum):
+    CONNECTED = "connected"
+    DISCONNECTED = "disconnected"
+    ERROR = "error"
+    CONNECTING = "connecting"
+
+
+class QueryStatus(enum.Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCESS = "success"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+    TIMEOUT = "timeout"
+
+
+class QueryType(enum.Enum):
+    SELECT = "select"
+    INSERT = "insert"
+    UPDATE = "update"
+    DELETE = "delete"
+    CREATE = "create"
+    DROP = "drop"
+    ALTER = "alter"
+    TRUNCATE = "truncate"
+    OTHER = "other"
+
+
+class RiskLevel(enum.Enum):
+    LOW = "low"
+    MEDIUM = "medium"
+    HIGH = "high"
+    CRITICAL = "critical"
+
+
+class ApprovalStatus(enum.Enum):
+    PENDING = "pending"
+    APPROVED = "approved"
+    REJECTED = "rejected"
+    EXPIRED = "expired"
+    CANCELLED = "cancelled"
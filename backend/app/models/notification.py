@@ -3,11 +3,12 @@ Complete Notification Models - Final Version
 Created: 2025-05-29 13:50:14 UTC by Teeksss
 """
 
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, Enum, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, Enum, ForeignKey, JSON, Index
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 import enum
 from app.core.database import Base
+from app.models.types import BigIntegerType, StringArrayType
 
 
 class NotificationStatus(enum.Enum):
@@ -32,6 +33,13 @@ class NotificationPriority(enum.Enum):
     CRITICAL = "critical"
 
 
+# Shared column types: one Enum object per PostgreSQL enum type, reused by
+# every column that stores it (names match the types already created)
+notification_status_enum = Enum(NotificationStatus, name="notificationstatus")
+notification_channel_enum = Enum(NotificationChannel, name="notificationchannel")
+notification_priority_enum = Enum(NotificationPriority, name="notificationpriority")
+
+
 class NotificationRule(Base):
     """Notification rules for automated notifications"""
     __tablename__ = "notification_rules"
@@ -42,32 +50,32 @@ class NotificationRule(Base):
     notification_type = Column(String(100), nullable=False)
     conditions = Column(JSON)  # JSON conditions for when to trigger
     actions = Column(JSON)     # JSON actions to take
-    priority = Column(Enum(NotificationPriority), default=NotificationPriority.NORMAL)
+    priority = Column(notification_priority_enum, default=NotificationPriority.NORMAL)
     cooldown_minutes = Column(Integer, default=0)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     created_by = Column(Integer, ForeignKey("users.id"))
 
     # Relationships
-    creator = relationship("User", back_populates="notification_rules")
-    deliveries = relationship("NotificationDelivery", back_populates="rule")
+    creator = relationship("User", back_populates="notification_rules", lazy="selectin")
+    deliveries = relationship("NotificationDelivery", back_populates="rule", passive_deletes="all")
 
 
 class NotificationDelivery(Base):
     """Record of notification deliveries"""
     __tablename__ = "notification_deliveries"
 
-    id = Column(Integer, primary_key=True, index=True)
-    rule_id = Column(Integer, ForeignKey("notification_rules.id"), nullable=True)
+    id = Column(BigIntegerType, primary_key=True, index=True)
+    rule_id = Column(Integer, ForeignKey("notification_rules.id", ondelete="CASCADE"), nullable=True, index=True)
     type = Column(String(100), nullable=False)
-    channel = Column(Enum(NotificationChannel), nullable=False)
-    priority = Column(Enum(NotificationPriority), default=NotificationPriority.NORMAL)
-    recipients = Column(Text)  # Comma-separated list
+    channel = Column(notification_channel_enum, nullable=False)
+    priority = Column(notification_priority_enum, default=NotificationPriority.NORMAL)
+    recipients = Column(StringArrayType)
     subject = Column(String(500))
     message = Column(Text)
     data = Column(JSON)  # Additional data
-    status = Column(Enum(NotificationStatus), default=NotificationStatus.PENDING)
+    status = Column(notification_status_enum, default=NotificationStatus.PENDING)
     error_message = Column(Text)
     delivered_at = Column(DateTime(timezone=True))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -75,6 +83,14 @@ class NotificationDelivery(Base):
     # Relationships
     rule = relationship("NotificationRule", back_populates="deliveries")
 
+    # The dispatcher polls only pending deliveries; the partial index stays
+    # small no matter how many sent/failed rows accumulate
+    __table_args__ = (
+        Index("ix_notif_recipients_gin", "recipients", postgresql_using="gin"),
+        Index("ix_notif_pending", "priority", "created_at",
+              postgresql_where=text("status = 'PENDING'")),
+    )
+
 
 class NotificationTemplate(Base):
     """Email and notification templates"""
@@ -90,7 +106,7 @@ class NotificationTemplate(Base):
     variables = Column(JSON)  # List of available variables
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     created_by = Column(Integer, ForeignKey("users.id"))
 
     # Relationships
@@ -104,15 +120,15 @@ class NotificationPreference(Base):
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     notification_type = Column(String(100), nullable=False)
-    channel = Column(Enum(NotificationChannel), nullable=False)
+    channel = Column(notification_channel_enum, nullable=False)
     is_enabled = Column(Boolean, default=True)
-    min_priority = Column(Enum(NotificationPriority), default=NotificationPriority.LOW)
+    min_priority = Column(notification_priority_enum, default=NotificationPriority.LOW)
     cooldown_minutes = Column(Integer, default=0)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     # Relationships
-    user = relationship("User", back_populates="notification_preferences")
+    user = relationship("User", back_populates="notification_preferences_rel")
 
     # Unique constraint
     __table_args__ = (
@@ -3,67 +3,41 @@ Complete Query Models - Final Version
 Created: 2025-05-29 13:50:14 UTC by Teeksss
 """
 
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, Float, JSON, Enum, ForeignKey
-from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
-import enum
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, Float, JSON, Enum, ForeignKey, Index, Computed, update, or_
+from sqlalchemy.orm import deferred, relationship
+from sqlalchemy.sql import func, text
+# Enums live in app.models.enums; re-exported here for existing imports
+from app.models.enums import QueryStatus, QueryType, RiskLevel, ApprovalStatus  # noqa: F401
 from app.core.database import Base
+from app.models.types import BigIntegerType, HexDigestType
 
 
-class QueryStatus(enum.Enum):
-    PENDING = "pending"
-    RUNNING = "running"
-    SUCCESS = "success"
-    FAILED = "failed"
-    CANCELLED = "cancelled"
-    TIMEOUT = "timeout"
-
-
-class QueryType(enum.Enum):
-    SELECT = "select"
-    INSERT = "insert"
-    UPDATE = "update"
-    DELETE = "delete"
-    CREATE = "create"
-    DROP = "drop"
-    ALTER = "alter"
-    TRUNCATE = "truncate"
-    OTHER = "other"
-
-
-class RiskLevel(enum.Enum):
-    LOW = "low"
-    MEDIUM = "medium"
-    HIGH = "high"
-    CRITICAL = "critical"
-
-
-class ApprovalStatus(enum.Enum):
-    PENDING = "pending"
-    APPROVED = "approved"
-    REJECTED = "rejected"
-    EXPIRED = "expired"
-    CANCELLED = "cancelled"
+# Shared column types: one Enum object per PostgreSQL enum type, reused by
+# every column that stores it (names match the types already created)
+query_status_enum = Enum(QueryStatus, name="querystatus")
+query_type_enum = Enum(QueryType, name="querytype")
+risk_level_enum = Enum(RiskLevel, name="risklevel")
+approval_status_enum = Enum(ApprovalStatus, name="approvalstatus")
 
 
 class QueryExecution(Base):
     """Query execution history and results"""
     __tablename__ = "query_executions"
 
-    id = Column(Integer, primary_key=True, index=True)
-    query_hash = Column(String(64), index=True, nullable=False)
+    id = Column(BigIntegerType, primary_key=True, index=True)
+    query_hash = Column(HexDigestType(32), index=True, nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     server_id = Column(Integer, ForeignKey("sql_server_connections.id"), nullable=False)
     
     # Query details
     original_query = Column(Text, nullable=False)
     normalized_query = Column(Text)
-    query_preview = Column(String(500))
-    query_type = Column(Enum(QueryType))
+    query_preview = Column(String(500), Computed("substr(original_query, 1, 500)", persisted=True))
+    query_type = Column(query_type_enum)
     parameters = Column(JSON)
     
     # Execution details
-    status = Column(Enum(QueryStatus), default=QueryStatus.PENDING)
+    status = Column(query_status_enum, default=QueryStatus.PENDING)
     started_at = Column(DateTime(timezone=True), server_default=func.now())
     completed_at = Column(DateTime(timezone=True))
     execution_time_ms = Column(Integer)
@@ -73,23 +47,23 @@ class QueryExecution(Base):
     rows_returned = Column(Integer, default=0)
     rows_affected = Column(Integer, default=0)
     result_size_bytes = Column(Integer, default=0)
-    columns_metadata = Column(JSON)
+    columns_metadata = deferred(Column(JSON), group="details")
     
     # Error handling
     error_message = Column(Text)
     error_code = Column(String(50))
-    error_details = Column(JSON)
+    error_details = deferred(Column(JSON), group="details")
     
     # Performance metrics
     parse_time_ms = Column(Integer)
     compile_time_ms = Column(Integer)
-    execution_plan = Column(JSON)
-    statistics = Column(JSON)
+    execution_plan = deferred(Column(JSON), group="details")
+    statistics = deferred(Column(JSON), group="details")
     
     # Security and compliance
-    risk_level = Column(Enum(RiskLevel), default=RiskLevel.LOW)
-    security_warnings = Column(JSON)
-    compliance_flags = Column(JSON)
+    risk_level = Column(risk_level_enum, default=RiskLevel.LOW)
+    security_warnings = deferred(Column(JSON), group="details")
+    compliance_flags = deferred(Column(JSON), group="details")
     requires_approval = Column(Boolean, default=False)
     approval_id = Column(Integer, ForeignKey("query_approvals.id"))
     
@@ -104,11 +78,21 @@ class QueryExecution(Base):
     export_format = Column(String(20))
     export_size_bytes = Column(Integer)
     
-    # Relationships
+    # Relationships (listings opt in with selectinload() per query)
     user = relationship("User", back_populates="query_executions")
     server = relationship("SQLServerConnection", back_populates="query_executions")
-    approval = relationship("QueryApproval", back_populates="execution")
-    exports = relationship("QueryExport", back_populates="execution")
+    approval = relationship("QueryApproval", foreign_keys=[approval_id])
+    exports = relationship("QueryExport", back_populates="execution", passive_deletes="all")
+    
+    # Hot-path indexes for history, server and status views. The per-user
+    # history index covers the timing columns so listings can use
+    # index-only scans on PostgreSQL.
+    __table_args__ = (
+        Index("ix_qexec_user_started", "user_id", "started_at",
+              postgresql_include=("execution_time_ms", "rows_returned")),
+        Index("ix_qexec_server_status", "server_id", "status"),
+        Index("ix_qexec_status_started", "status", "started_at"),
+    )
 
 
 class QueryApproval(Base):
@@ -116,20 +100,20 @@ class QueryApproval(Base):
     __tablename__ = "query_approvals"
 
     id = Column(Integer, primary_key=True, index=True)
-    execution_id = Column(Integer, ForeignKey("query_executions.id"), nullable=False)
+    execution_id = Column(BigIntegerType, ForeignKey("query_executions.id", ondelete="CASCADE"), nullable=False, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     approved_by = Column(Integer, ForeignKey("users.id"))
     
     # Request details
-    query_hash = Column(String(64), nullable=False)
+    query_hash = Column(HexDigestType(32), nullable=False)
     query_preview = Column(String(500))
-    query_type = Column(Enum(QueryType))
-    risk_level = Column(Enum(RiskLevel))
+    query_type = Column(query_type_enum)
+    risk_level = Column(risk_level_enum)
     risk_factors = Column(JSON)
     justification = Column(Text)
     
     # Approval details
-    status = Column(Enum(ApprovalStatus), default=ApprovalStatus.PENDING)
+    status = Column(approval_status_enum, default=ApprovalStatus.PENDING)
     requested_at = Column(DateTime(timezone=True), server_default=func.now())
     reviewed_at = Column(DateTime(timezone=True))
     expires_at = Column(DateTime(timezone=True))
@@ -144,10 +128,16 @@ class QueryApproval(Base):
     approval_rule_id = Column(Integer)
     
     # Relationships
-    execution = relationship("QueryExecution", back_populates="approval")
-    user = relationship("User", back_populates="query_approvals")
+    execution = relationship("QueryExecution", foreign_keys=[execution_id], lazy="selectin")
+    user = relationship("User", back_populates="query_approvals", foreign_keys=[user_id], lazy="selectin")
     approved_by_user = relationship("User", back_populates="approved_queries", 
-                                  foreign_keys=[approved_by])
+                                  foreign_keys=[approved_by], lazy="selectin")
+
+    # Partial index for the pending-approval queue
+    __table_args__ = (
+        Index("ix_qapproval_pending", "requested_at",
+              postgresql_where=text("status = 'PENDING'")),
+    )
 
 
 class QueryWhitelist(Base):
@@ -155,15 +145,15 @@ class QueryWhitelist(Base):
     __tablename__ = "query_whitelists"
 
     id = Column(Integer, primary_key=True, index=True)
-    query_hash = Column(String(64), unique=True, index=True, nullable=False)
+    query_hash = Column(HexDigestType(32), unique=True, index=True, nullable=False)
     original_query = Column(Text, nullable=False)
     normalized_query = Column(Text, nullable=False)
     query_pattern = Column(Text)
-    query_type = Column(Enum(QueryType))
+    query_type = Column(query_type_enum)
     
     # Approval details
-    risk_level = Column(Enum(RiskLevel), default=RiskLevel.LOW)
-    status = Column(Enum(ApprovalStatus), default=ApprovalStatus.APPROVED)
+    risk_level = Column(risk_level_enum, default=RiskLevel.LOW)
+    status = Column(approval_status_enum, default=ApprovalStatus.APPROVED)
     approved_by = Column(Integer, ForeignKey("users.id"), nullable=False)
     created_by = Column(Integer, ForeignKey("users.id"), nullable=False)
     
@@ -184,12 +174,27 @@ class QueryWhitelist(Base):
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     last_used_at = Column(DateTime(timezone=True))
     
     # Relationships
-    approver = relationship("User", foreign_keys=[approved_by])
-    creator = relationship("User", foreign_keys=[created_by])
+    approver = relationship("User", foreign_keys=[approved_by], lazy="selectin")
+    creator = relationship("User", foreign_keys=[created_by], lazy="selectin")
+    
+    @classmethod
+    def record_execution(cls, session, pk: int) -> bool:
+        """Atomically count one execution; False if max_executions is already used up"""
+        result = session.execute(
+            update(cls)
+            .where(
+                cls.id == pk,
+                or_(cls.max_executions.is_(None),
+                    func.coalesce(cls.current_executions, 0) < cls.max_executions)
+            )
+            .values(current_executions=func.coalesce(cls.current_executions, 0) + 1,
+                    last_used_at=func.now())
+        )
+        return result.rowcount == 1
 
 
 class QueryTemplate(Base):
@@ -220,7 +225,7 @@ class QueryTemplate(Base):
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
     # Relationships
     creator = relationship("User")
@@ -231,7 +236,7 @@ class QueryExport(Base):
     __tablename__ = "query_exports"
 
     id = Column(Integer, primary_key=True, index=True)
-    execution_id = Column(Integer, ForeignKey("query_executions.id"), nullable=False)
+    execution_id = Column(BigIntegerType, ForeignKey("query_executions.id", ondelete="CASCADE"), nullable=False, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     
     # Export details
@@ -266,6 +271,12 @@ class QueryExport(Base):
     execution = relationship("QueryExecution", back_populates="exports")
     user = relationship("User")
 
+    # Partial index for the pending-export queue
+    __table_args__ = (
+        Index("ix_qexport_pending", "started_at",
+              postgresql_where=text("status = 'pending'")),
+    )
+
 
 class QuerySchedule(Base):
     """Scheduled query executions"""
@@ -310,8 +321,8 @@ class QuerySchedule(Base):
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
     # Relationships
     user = relationship("User")
-    server = relationship("SQLServerConnection")
\ No newline at end of file
+    server = relationship("SQLServerConnection")
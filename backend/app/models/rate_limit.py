@@ -1,12 +1,14 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Float
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Float, Index, Enum, UniqueConstraint
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from enum import Enum as PyEnum
 import json
 
 from app.core.database import Base
+from app.models.types import BigIntegerType, IntegerArrayType, StringArrayType, enum_values, frozen_column
 
-class RateLimitType(PyEnum):
+class RateLimitType(str, PyEnum):
     """Rate limit target types"""
     USER = "user"
     IP = "ip"
@@ -32,9 +34,9 @@ class RateLimitProfile(Base):
     
     # Advanced limits
     max_query_complexity_score = Column(Float, default=100.0)
-    allowed_query_types = Column(Text)  # JSON array: ["SELECT", "INSERT"]
-    blocked_tables = Column(Text)       # JSON array of blocked table patterns
-    allowed_hours = Column(Text)        # JSON array: [9, 10, 11, ..., 17] for business hours
+    allowed_query_types = Column(StringArrayType)  # ["SELECT", "INSERT"]
+    blocked_tables = Column(StringArrayType)       # Blocked table patterns
+    allowed_hours = Column(IntegerArrayType)       # [9, 10, 11, ..., 17] for business hours
     
     # Profile settings
     is_default = Column(Boolean, default=False)
@@ -43,22 +45,37 @@ class RateLimitProfile(Base):
     
     # Metadata
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     created_by = Column(String)
     
     # Relationships
     users = relationship("User", back_populates="rate_limit_profile")
-    rate_limit_rules = relationship("RateLimitRule", back_populates="profile")
+    rate_limit_rules = relationship("RateLimitRule", back_populates="profile", lazy="selectin", passive_deletes="all")
+    
+    @property
+    def allowed_query_types_set(self):
+        """allowed_query_types as a frozenset (None if unrestricted)"""
+        return frozen_column(self, "allowed_query_types")
+    
+    @property
+    def blocked_tables_set(self):
+        """blocked_tables as a frozenset (None if nothing is blocked)"""
+        return frozen_column(self, "blocked_tables")
+    
+    @property
+    def allowed_hours_set(self):
+        """allowed_hours as a frozenset (None if unrestricted)"""
+        return frozen_column(self, "allowed_hours")
 
 class RateLimitRule(Base):
     __tablename__ = "rate_limit_rules"
     
     id = Column(Integer, primary_key=True, index=True)
-    profile_id = Column(Integer, ForeignKey("rate_limit_profiles.id"))
+    profile_id = Column(Integer, ForeignKey("rate_limit_profiles.id", ondelete="CASCADE"), index=True)
     
     # Rule identification
     rule_name = Column(String, nullable=False)
-    target_type = Column(String, nullable=False)  # user, ip, role, global
+    target_type = Column(Enum(RateLimitType, name="rate_limit_type", values_callable=enum_values, create_constraint=True, validate_strings=True), nullable=False)
     target_value = Column(String)  # user_id, IP address, role name, or "global"
     
     # Limits
@@ -83,12 +100,12 @@ class RateLimitRule(Base):
     expires_at = Column(DateTime(timezone=True))  # Temporary rules
     
     # Relationships
-    profile = relationship("RateLimitProfile", back_populates="rate_limit_rules")
+    profile = relationship("RateLimitProfile", back_populates="rate_limit_rules", lazy="selectin")
 
 class RateLimitExecution(Base):
     __tablename__ = "rate_limit_executions"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(BigIntegerType, primary_key=True, index=True)
     
     # Tracking information
     target_type = Column(String, nullable=False)
@@ -110,6 +127,52 @@ class RateLimitExecution(Base):
     reset_reason = Column(String)  # manual, expired, success
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # One counter row per target and window; also serves the per-target
+    # window lookup on every rate-limited request
+    __table_args__ = (
+        UniqueConstraint("target_type", "target_value", "window_start", name="uq_rle_window"),
+    )
+    
+    @classmethod
+    def bump(cls, session, target_type: str, target_value: str, window_start, window_end, n: int = 1, **values):
+        """Add n requests to a target's window counter with a single atomic upsert"""
+        insert = _UPSERT_INSERTS.get(session.get_bind().dialect.name)
+        if insert is None:
+            # No ON CONFLICT support; fall back to a locked read-modify-write
+            execution = session.query(cls).filter(
+                cls.target_type == target_type,
+                cls.target_value == target_value,
+                cls.window_start == window_start
+            ).with_for_update().first()
+            if execution:
+                execution.request_count = (execution.request_count or 0) + n
+            else:
+                session.add(cls(
+                    target_type=target_type, target_value=target_value,
+                    window_start=window_start, window_end=window_end,
+                    request_count=n, **values
+                ))
+            return
+        
+        stmt = insert(cls).values(
+            target_type=target_type,
+            target_value=target_value,
+            window_start=window_start,
+            window_end=window_end,
+            request_count=n,
+            **values
+        )
+        session.execute(stmt.on_conflict_do_update(
+            index_elements=["target_type", "target_value", "window_start"],
+            set_={"request_count": cls.request_count + stmt.excluded.request_count}
+        ))
+
+# Dialect-specific INSERT constructs that support ON CONFLICT DO UPDATE
+_UPSERT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
 
 class RateLimitException(Base):
     __tablename__ = "rate_limit_exceptions"
@@ -139,4 +202,4 @@ class RateLimitException(Base):
     approved_by = Column(String)
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
\ No newline at end of file
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
\ No newline at end of file
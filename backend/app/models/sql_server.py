@@ -3,40 +3,20 @@ Complete SQL Server Models - Final Version
 Created: 2025-05-29 13:50:14 UTC by Teeksss
 """
 
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, JSON, Enum, Float, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, JSON, Float, ForeignKey, Index, literal, select
+from sqlalchemy.dialects.postgresql import INET
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-import enum
+from functools import lru_cache
+import ipaddress
+# Enums live in app.models.enums; re-exported here for existing imports
+from app.models.enums import ServerType, Environment, HealthStatus, ConnectionStatus  # noqa: F401
 from app.core.database import Base
+from app.models.types import CIDRType, EnumStr, JSONBType, frozen_column
 
 
-class ServerType(enum.Enum):
-    MSSQL = "mssql"
-    POSTGRESQL = "postgresql"
-    MYSQL = "mysql"
-    ORACLE = "oracle"
-    SQLITE = "sqlite"
-
-
-class Environment(enum.Enum):
-    PRODUCTION = "production"
-    STAGING = "staging"
-    DEVELOPMENT = "development"
-    TEST = "test"
-
-
-class HealthStatus(enum.Enum):
-    HEALTHY = "healthy"
-    DEGRADED = "degraded"
-    UNHEALTHY = "unhealthy"
-    UNKNOWN = "unknown"
-
-
-class ConnectionStatus(enum.Enum):
-    CONNECTED = "connected"
-    DISCONNECTED = "disconnected"
-    ERROR = "error"
-    CONNECTING = "connecting"
+# Shared by the connection's current status and each health check row
+health_status_enum = EnumStr(HealthStatus)
 
 
 class SQLServerConnection(Base):
@@ -48,7 +28,7 @@ class SQLServerConnection(Base):
     description = Column(Text)
     
     # Connection details
-    server_type = Column(Enum(ServerType), nullable=False)
+    server_type = Column(EnumStr(ServerType), nullable=False)
     host = Column(String(255), nullable=False)
     port = Column(Integer, nullable=False)
     database = Column(String(255), nullable=False)
@@ -57,7 +37,10 @@ class SQLServerConnection(Base):
     
     # Additional connection parameters
     connection_string = Column(Text)
+    connection_string_template = Column(Text)
     additional_params = Column(JSON)
+    connection_timeout = Column(Integer, default=30)  # seconds
+    query_timeout = Column(Integer, default=300)  # seconds
     
     # SSL/TLS configuration
     use_ssl = Column(Boolean, default=False)
@@ -67,7 +50,7 @@ class SQLServerConnection(Base):
     verify_ssl_cert = Column(Boolean, default=True)
     
     # Environment and access control
-    environment = Column(Enum(Environment), default=Environment.DEVELOPMENT)
+    environment = Column(EnumStr(Environment), default=Environment.DEVELOPMENT)
     is_read_only = Column(Boolean, default=True)
     is_active = Column(Boolean, default=True)
     is_public = Column(Boolean, default=False)
@@ -84,8 +67,10 @@ class SQLServerConnection(Base):
     max_concurrent_queries = Column(Integer, default=10)
     
     # Health monitoring
-    health_status = Column(Enum(HealthStatus), default=HealthStatus.UNKNOWN)
+    health_status = Column(health_status_enum, default=HealthStatus.UNKNOWN)
     last_health_check = Column(DateTime(timezone=True))
+    health_message = Column(Text)
+    response_time_ms = Column(Integer)
     health_check_interval = Column(Integer, default=300)  # seconds
     consecutive_failures = Column(Integer, default=0)
     
@@ -96,7 +81,7 @@ class SQLServerConnection(Base):
     failed_queries = Column(Integer, default=0)
     
     # Connection status
-    connection_status = Column(Enum(ConnectionStatus), default=ConnectionStatus.DISCONNECTED)
+    connection_status = Column(EnumStr(ConnectionStatus), default=ConnectionStatus.DISCONNECTED)
     last_connection_test = Column(DateTime(timezone=True))
     last_connection_error = Column(Text)
     
@@ -119,8 +104,10 @@ class SQLServerConnection(Base):
     backup_location = Column(String(500))
     
     # Access control
-    allowed_roles = Column(JSON)  # List of roles that can access this server
-    restricted_operations = Column(JSON)  # List of restricted SQL operations
+    allowed_roles = Column(JSONBType)  # List of roles that can access this server
+    restricted_operations = Column(JSONBType)  # List of restricted SQL operations
+    allowed_user_roles = Column(JSONBType)  # Roles allowed by is_user_allowed
+    allowed_users = Column(JSONBType)  # User IDs allowed by is_user_allowed
     whitelist_only = Column(Boolean, default=False)
     
     # Audit settings
@@ -131,7 +118,7 @@ class SQLServerConnection(Base):
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     created_by = Column(Integer, ForeignKey("users.id"))
     updated_by = Column(Integer, ForeignKey("users.id"))
     
@@ -143,8 +130,39 @@ class SQLServerConnection(Base):
     health_checks = relationship("ServerHealthCheck", back_populates="server")
     performance_metrics = relationship("ServerPerformanceMetric", back_populates="server")
     
+    # Serves containment filters such as allowed_roles @> '["analyst"]'
+    __table_args__ = (
+        Index("ix_sqlsrv_allowed_roles_gin", "allowed_roles", postgresql_using="gin"),
+    )
+    
     def __repr__(self):
         return f"<SQLServerConnection(name='{self.name}', type='{self.server_type}', host='{self.host}')>"
+    
+    def get_connection_string(self) -> str:
+        """Generate connection string based on server type and settings"""
+        if self.connection_string_template:
+            return _render_template(
+                self.connection_string_template, self.host, self.port, self.database, self.username
+            )
+        
+        if self.server_type == ServerType.MSSQL:
+            return _render_mssql(
+                self.host, self.port, self.database, self.username, self.connection_timeout, self.use_ssl
+            )
+        
+        return f"host={self.host} port={self.port} dbname={self.database}"
+    
+    def is_user_allowed(self, user_id: int, user_role: str) -> bool:
+        """Check if user is allowed to access this server"""
+        allowed_roles = frozen_column(self, "allowed_user_roles")
+        if allowed_roles is not None and user_role not in allowed_roles:
+            return False
+        
+        allowed_users = frozen_column(self, "allowed_users")
+        if allowed_users is not None and user_id not in allowed_users:
+            return False
+        
+        return True
 
 
 class ServerHealthCheck(Base):
@@ -155,7 +173,7 @@ class ServerHealthCheck(Base):
     server_id = Column(Integer, ForeignKey("sql_server_connections.id"), nullable=False)
     
     # Health check details
-    status = Column(Enum(HealthStatus), nullable=False)
+    status = Column(health_status_enum, nullable=False)
     response_time_ms = Column(Float)
     error_message = Column(Text)
     
@@ -182,6 +200,11 @@ class ServerHealthCheck(Base):
     
     # Relationships
     server = relationship("SQLServerConnection", back_populates="health_checks")
+    
+    # Probes are appended in checked_at order; BRIN serves the time-window scans
+    __table_args__ = (
+        Index("ix_healthcheck_checked_brin", "checked_at", postgresql_using="brin", postgresql_with={"pages_per_range": 32}),
+    )
 
 
 class ServerPerformanceMetric(Base):
@@ -226,6 +249,12 @@ class ServerPerformanceMetric(Base):
     
     # Relationships
     server = relationship("SQLServerConnection", back_populates="performance_metrics")
+    
+    # Rows arrive in metric_date order, so a BRIN index serves time-window
+    # scans at a fraction of a B-tree's size
+    __table_args__ = (
+        Index("ix_perfmetric_date_brin", "metric_date", postgresql_using="brin", postgresql_with={"pages_per_range": 32}),
+    )
 
 
 class ServerConfiguration(Base):
@@ -248,7 +277,7 @@ class ServerConfiguration(Base):
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     created_by = Column(Integer, ForeignKey("users.id"))
     
     # Relationships
@@ -282,4 +311,97 @@ class ServerTag(Base):
     # Unique constraint
     __table_args__ = (
         {"schema": None},
-    )
\ No newline at end of file
+    )
+
+
+class ServerHealthHistory(Base):
+    """Connection probe history recorded by HealthService"""
+    __tablename__ = "server_health_history"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    server_id = Column(Integer, ForeignKey("sql_server_connections.id", ondelete="CASCADE"), nullable=False, index=True)
+    
+    # Health metrics
+    status = Column(String, nullable=False)  # healthy, unhealthy, timeout, error
+    response_time_ms = Column(Integer)
+    error_message = Column(Text)
+    
+    # Performance metrics
+    cpu_usage_percent = Column(Float)
+    memory_usage_percent = Column(Float)
+    disk_usage_percent = Column(Float)
+    active_connections = Column(Integer)
+    
+    # Timestamp
+    checked_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # Append-only, filtered by "checked since"; see ServerHealthCheck
+    __table_args__ = (
+        Index("ix_healthhistory_checked_brin", "checked_at", postgresql_using="brin", postgresql_with={"pages_per_range": 32}),
+    )
+
+
+class ServerIPWhitelist(Base):
+    """Client IP ranges allowed to use a server (no rows means unrestricted)"""
+    __tablename__ = "server_ip_whitelist"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    server_id = Column(Integer, ForeignKey("sql_server_connections.id", ondelete="CASCADE"), nullable=False, index=True)
+    cidr = Column(CIDRType, nullable=False)
+    description = Column(Text)
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_by = Column(String)
+    
+    # Lets PostgreSQL answer "client IP <<= cidr" from the index
+    __table_args__ = (
+        Index("ix_sipw_cidr_gist", "cidr", postgresql_using="gist", postgresql_ops={"cidr": "inet_ops"}),
+    )
+    
+    @classmethod
+    def allows(cls, session, server_id: int, client_ip: str) -> bool:
+        """Check a client IP against a server's whitelist (no entries means unrestricted)"""
+        entries = select(cls.cidr).where(cls.server_id == server_id)
+        
+        # Unparseable peers (None, "testclient", unix sockets) never match an
+        # entry and must not reach the INET cast, which aborts the transaction
+        try:
+            address = ipaddress.ip_address(client_ip)
+        except ValueError:
+            return not session.scalar(select(entries.exists()))
+        
+        if session.get_bind().dialect.name == "postgresql":
+            matched = entries.where(literal(str(address), INET).op("<<=")(cls.cidr))
+            if session.scalar(select(matched.exists())):
+                return True
+            return not session.scalar(select(entries.exists()))
+        
+        cidrs = session.scalars(entries).all()
+        return not cidrs or any(address in ipaddress.ip_network(cidr, strict=False) for cidr in cidrs)
+
+
+# Rendered connection strings never contain the password, so they can be
+# shared across instances and requests
+@lru_cache(maxsize=512)
+def _render_template(template: str, host, port, database, username) -> str:
+    return template.format(
+        host=host,
+        port=port,
+        database=database,
+        username=username,
+        password="***"  # Don't expose password
+    )
+
+
+@lru_cache(maxsize=512)
+def _render_mssql(host, port, database, username, timeout, use_ssl) -> str:
+    server_addr = f"{host},{port}" if port != 1433 else host
+    return (
+        f"DRIVER={{ODBC Driver 17 for SQL Server}};"
+        f"SERVER={server_addr};"
+        f"DATABASE={database};"
+        f"UID={username};"
+        f"PWD=***;"
+        f"Connection Timeout={timeout};"
+        f"Encrypt={'yes' if use_ssl else 'no'};"
+    )
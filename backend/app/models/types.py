@@ -0,0 +1,94 @@
+"""
+Shared Column Types - Database-portable column types for models
+"""
+
+from enum import Enum as PyEnum
+
+from sqlalchemy import JSON, BigInteger, Integer, LargeBinary, String
+from sqlalchemy.types import TypeDecorator
+from sqlalchemy.dialects.postgresql import ARRAY, CIDR, JSONB
+
+class HexDigestType(TypeDecorator):
+    """Hex digest string in Python, stored as raw bytes (half the index size)"""
+    impl = LargeBinary
+    cache_ok = True
+    
+    def process_bind_param(self, value, dialect):
+        return bytes.fromhex(value) if isinstance(value, str) else value
+    
+    def process_result_value(self, value, dialect):
+        return value.hex() if value is not None else None
+
+class EnumStr(TypeDecorator):
+    """Python Enum stored as its plain string value, with no database enum type"""
+    impl = String
+    cache_ok = True
+    
+    def __init__(self, enum_cls, length: int = 20):
+        super().__init__(length=length)
+        self._enum = enum_cls
+    
+    def process_bind_param(self, value, dialect):
+        return value.value if isinstance(value, PyEnum) else value
+    
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        try:
+            return self._enum(value)
+        except ValueError:
+            # Rows written by the old Enum columns hold member names
+            return self._enum[value]
+
+def enum_values(enum_cls):
+    """Persist enum values (not member names) so stored strings stay readable"""
+    return [member.value for member in enum_cls]
+
+def frozen_column(instance, column: str):
+    """Frozenset of a list column, rebuilt only when the column is reassigned"""
+    raw = getattr(instance, column)
+    cache = instance.__dict__.setdefault("_frozen_cache", {})
+    cached = cache.get(column)
+    if cached is None or cached[0] is not raw:
+        cached = cache[column] = (raw, frozenset(raw) if raw else None)
+    return cached[1]
+
+# JSON stored as JSONB on PostgreSQL (indexable, parsed once by the server)
+# and as plain JSON on other backends such as the SQLite test database
+JSONBType = JSON().with_variant(JSONB(), "postgresql")
+
+# 64-bit keys for append-only log tables; SQLite only autoincrements
+# INTEGER primary keys, so it keeps the 32-bit type there
+BigIntegerType = BigInteger().with_variant(Integer, "sqlite")
+
+class JSONText(str):
+    """JSON document already serialized to text"""
+
+class PreserializedJSONBType(TypeDecorator):
+    """JSONBType that binds JSONText values as-is instead of serializing them again"""
+    impl = JSON
+    cache_ok = True
+    
+    def load_dialect_impl(self, dialect):
+        return dialect.type_descriptor(JSONB() if dialect.name == "postgresql" else JSON())
+    
+    def bind_processor(self, dialect):
+        serialize = self.load_dialect_impl(dialect).bind_processor(dialect)
+        
+        def process(value):
+            if isinstance(value, JSONText):
+                return str(value)
+            return serialize(value) if serialize else value
+        
+        return process
+
+# Lists stored as native arrays on PostgreSQL (GIN-indexable, ANY() filters)
+# and as JSON arrays elsewhere
+StringArrayType = JSON().with_variant(ARRAY(String), "postgresql")
+IntegerArrayType = JSON().with_variant(ARRAY(Integer), "postgresql")
+
+# Network ranges as native CIDR on PostgreSQL (GiST-indexable containment
+# checks) and as their text form elsewhere
+CIDRType = String(43).with_variant(CIDR(), "postgresql")
+
+__all__ = ["JSONBType", "JSONText", "PreserializedJSONBType", "CIDRType", "BigIntegerType", "HexDigestType", "EnumStr", "StringArrayType", "IntegerArrayType", "enum_values", "frozen_column"]
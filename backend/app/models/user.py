@@ -3,25 +3,32 @@ Complete User Models - Final Version
 Created: 2025-05-29 13:50:14 UTC by Teeksss
 """
 
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, JSON, Enum, ForeignKey
-from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy import CheckConstraint, Column, Computed, Integer, String, Boolean, DateTime, Text, JSON, ForeignKey, Index, and_, event
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import deferred, relationship
+from sqlalchemy.sql import func, text
+from datetime import timezone
 import enum
+from app.core.clock import request_now
+# Enums live in app.models.enums; re-exported here for existing imports
+from app.models.enums import UserRole, UserStatus  # noqa: F401
 from app.core.database import Base
+from app.models.types import EnumStr, JSONBType
 
 
-class UserRole(enum.Enum):
-    ADMIN = "admin"
-    ANALYST = "analyst"
-    POWERBI = "powerbi"
-    READONLY = "readonly"
+class UserPermission(enum.IntFlag):
+    """Role-derived permissions, packed into User.permissions_mask"""
+    EXECUTE = 1
+    APPROVE = 2
+    ADMIN = 4
 
 
-class UserStatus(enum.Enum):
-    ACTIVE = "active"
-    INACTIVE = "inactive"
-    SUSPENDED = "suspended"
-    PENDING = "pending"
+_ROLE_PERMISSIONS = {
+    UserRole.ADMIN: UserPermission.EXECUTE | UserPermission.APPROVE | UserPermission.ADMIN,
+    UserRole.ANALYST: UserPermission.EXECUTE,
+    UserRole.POWERBI: UserPermission.EXECUTE,
+    UserRole.READONLY: UserPermission(0),
+}
 
 
 class User(Base):
@@ -32,13 +39,26 @@ class User(Base):
     username = Column(String(100), unique=True, index=True, nullable=False)
     email = Column(String(255), unique=True, index=True, nullable=False)
     hashed_password = Column(String(255), nullable=False)
-    role = Column(Enum(UserRole), default=UserRole.READONLY)
-    status = Column(Enum(UserStatus), default=UserStatus.ACTIVE)
+    role = Column(EnumStr(UserRole), default=UserRole.READONLY)
+    status = Column(EnumStr(UserStatus), default=UserStatus.ACTIVE)
+    # Recomputed whenever role is assigned (see _sync_permissions_mask); the
+    # init SQL backfills it and keeps non-ORM writes in step with a trigger
+    permissions_mask = Column(Integer, default=0, nullable=False)
     
     # Profile information
     first_name = Column(String(100))
     last_name = Column(String(100))
     display_name = Column(String(200))
+    # Maintained by the database so searches and listings need no Python concat.
+    # nullif() makes empty strings count as missing, as in the full_name hybrid.
+    full_name_cached = Column(
+        String(201),
+        Computed(
+            "coalesce(nullif(first_name, '') || ' ' || nullif(last_name, ''), "
+            "nullif(display_name, ''), username)",
+            persisted=True
+        )
+    )
     avatar_url = Column(String(500))
     phone = Column(String(50))
     department = Column(String(100))
@@ -55,7 +75,7 @@ class User(Base):
     last_login_ip = Column(String(45))
     login_count = Column(Integer, default=0)
     failed_login_attempts = Column(Integer, default=0)
-    locked_until = Column(DateTime(timezone=True))
+    locked_until = Column(DateTime(timezone=True), index=True)
     
     # MFA settings
     mfa_enabled = Column(Boolean, default=False)
@@ -66,7 +86,7 @@ class User(Base):
     timezone = Column(String(50), default="UTC")
     language = Column(String(10), default="en")
     theme = Column(String(20), default="light")
-    notification_preferences = Column(JSON)
+    notification_preferences = Column(JSONBType)
     dashboard_config = Column(JSON)
     query_preferences = Column(JSON)
     
@@ -77,31 +97,32 @@ class User(Base):
     
     # Audit fields
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     created_by = Column(Integer, ForeignKey("users.id"))
     updated_by = Column(Integer, ForeignKey("users.id"))
     
     # LDAP fields
     ldap_dn = Column(String(500))
-    ldap_groups = Column(JSON)
+    ldap_groups = Column(JSONBType)
     ldap_last_sync = Column(DateTime(timezone=True))
     
-    # Session management
-    active_sessions = Column(JSON)
+    # Session management: live sessions are tracked in a Redis sorted set
+    # (see AuthService); this legacy column is never loaded unless asked for
+    active_sessions = deferred(Column(JSON))
     max_sessions = Column(Integer, default=5)
     
     # Relationships
-    manager = relationship("User", remote_side=[id], back_populates="direct_reports")
-    direct_reports = relationship("User", back_populates="manager")
+    manager = relationship("User", remote_side=[id], foreign_keys=[manager_id], back_populates="direct_reports")
+    direct_reports = relationship("User", foreign_keys=[manager_id], back_populates="manager")
     
     # Query relationships
     query_executions = relationship("QueryExecution", back_populates="user")
-    query_approvals = relationship("QueryApproval", back_populates="user")
+    query_approvals = relationship("QueryApproval", back_populates="user", foreign_keys="QueryApproval.user_id")
     approved_queries = relationship("QueryApproval", back_populates="approved_by_user", 
                                   foreign_keys="QueryApproval.approved_by")
     
     # Server access relationships
-    server_permissions = relationship("ServerPermission", back_populates="user")
+    server_permissions = relationship("ServerPermission", back_populates="user", foreign_keys="ServerPermission.user_id")
     
     # Notification relationships
     notification_rules = relationship("NotificationRule", back_populates="creator")
@@ -113,38 +134,72 @@ class User(Base):
     # Session relationships
     user_sessions = relationship("UserSession", back_populates="user")
     
+    # Serves group-membership lookups during LDAP sync
+    __table_args__ = (
+        CheckConstraint("permissions_mask >= 0", name="ck_users_permissions_mask"),
+        Index("ix_users_ldap_groups_gin", "ldap_groups", postgresql_using="gin"),
+        Index("ix_users_full_name_trgm", "full_name_cached", postgresql_using="gin",
+              postgresql_ops={"full_name_cached": "gin_trgm_ops"}),
+    )
+    
     def __repr__(self):
         return f"<User(username='{self.username}', email='{self.email}', role='{self.role}')>"
     
-    @property
+    @hybrid_property
     def full_name(self):
         """Get user's full name"""
         if self.first_name and self.last_name:
             return f"{self.first_name} {self.last_name}"
         return self.display_name or self.username
     
-    @property
+    @full_name.expression
+    def full_name(cls):
+        return cls.full_name_cached
+    
+    @hybrid_property
     def is_admin(self):
         """Check if user is admin"""
-        return self.role == UserRole.ADMIN
+        return bool((self.permissions_mask or 0) & UserPermission.ADMIN)
     
-    @property
+    @is_admin.expression
+    def is_admin(cls):
+        return cls.permissions_mask.op("&")(int(UserPermission.ADMIN)) != 0
+    
+    @hybrid_property
     def is_locked(self):
         """Check if user account is locked"""
         if self.locked_until:
-            from datetime import datetime
-            return datetime.utcnow() < self.locked_until
+            locked_until = self.locked_until
+            if locked_until.tzinfo is None:
+                locked_until = locked_until.replace(tzinfo=timezone.utc)
+            return request_now() < locked_until
         return False
     
-    @property
+    @is_locked.expression
+    def is_locked(cls):
+        return and_(cls.locked_until.isnot(None), cls.locked_until > func.now())
+    
+    @hybrid_property
     def can_execute_queries(self):
         """Check if user can execute queries"""
-        return self.role in [UserRole.ADMIN, UserRole.ANALYST, UserRole.POWERBI] and self.is_active
+        return bool((self.permissions_mask or 0) & UserPermission.EXECUTE) and self.is_active
+    
+    @can_execute_queries.expression
+    def can_execute_queries(cls):
+        return and_(cls.permissions_mask.op("&")(int(UserPermission.EXECUTE)) != 0, cls.is_active.is_(True))
     
     @property
     def can_approve_queries(self):
         """Check if user can approve queries"""
-        return self.role == UserRole.ADMIN and self.is_active
+        return bool((self.permissions_mask or 0) & UserPermission.APPROVE) and self.is_active
+
+
+@event.listens_for(User.role, "set")
+def _sync_permissions_mask(target, value, oldvalue, initiator):
+    """Keep permissions_mask in step with the assigned role"""
+    if isinstance(value, str):
+        value = UserRole(value)
+    target.permissions_mask = int(_ROLE_PERMISSIONS.get(value, 0))
 
 
 class UserSession(Base):
@@ -153,7 +208,7 @@ class UserSession(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    session_id = Column(String(255), unique=True, index=True, nullable=False)
+    session_id = Column(String(255), unique=True, nullable=False)
     ip_address = Column(String(45))
     user_agent = Column(Text)
     location = Column(String(255))
@@ -166,6 +221,15 @@ class UserSession(Base):
     # Relationships
     user = relationship("User", back_populates="user_sessions")
 
+    # A user's live sessions; partial so logged-out rows stay out of it.
+    # Sessions are inserted in created_at order, so BRIN covers date ranges.
+    __table_args__ = (
+        Index("ix_usersession_user_active", "user_id", "is_active", "expires_at",
+              postgresql_where=text("is_active")),
+        Index("ix_usersession_created_brin", "created_at", postgresql_using="brin",
+              postgresql_with={"pages_per_range": 32}),
+    )
+
 
 class ServerPermission(Base):
     """User permissions for specific servers"""
@@ -184,37 +248,15 @@ class ServerPermission(Base):
     created_by = Column(Integer, ForeignKey("users.id"))
 
     # Relationships
-    user = relationship("User", back_populates="server_permissions")
+    user = relationship("User", back_populates="server_permissions", foreign_keys=[user_id])
     server = relationship("SQLServerConnection", back_populates="user_permissions")
     creator = relationship("User", foreign_keys=[created_by])
 
-    # Unique constraint
+    # One grant per user and server; also serves the per-request lookup
     __table_args__ = (
-        {"schema": None},
+        Index("ix_serverperm_user_server", "user_id", "server_id", unique=True),
     )
 
 
-class AuditLog(Base):
-    """Comprehensive audit logging"""
-    __tablename__ = "audit_logs"
-
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"))
-    action = Column(String(100), nullable=False)
-    resource_type = Column(String(100))
-    resource_id = Column(String(100))
-    details = Column(JSON)
-    ip_address = Column(String(45))
-    user_agent = Column(Text)
-    session_id = Column(String(255))
-    timestamp = Column(DateTime(timezone=True), server_default=func.now())
-    severity = Column(String(20), default="INFO")
-    category = Column(String(50))
-    
-    # Security fields
-    risk_score = Column(Integer, default=0)
-    is_suspicious = Column(Boolean, default=False)
-    alert_triggered = Column(Boolean, default=False)
-
-    # Relationships
-    user = relationship("User", back_populates="audit_logs")
\ No newline at end of file
+# Audit rows are mapped in app.models.audit; re-exported for existing imports
+from app.models.audit import AuditLog  # noqa: E402,F401
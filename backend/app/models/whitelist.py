@@ -28,6 +28,6 @@ class RateLimitConfig(Base):
     requests_per_day = Column(Integer, default=1000)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
     user = relationship("User")
\ No newline at end of file
@@ -3,31 +3,31 @@ Complete Authentication Schemas - Final Version
 Created: 2025-05-29 14:38:00 UTC by Teeksss
 """
 
+import re
 from typing import Optional
-from pydantic import BaseModel, EmailStr, validator
-from app.models.user import UserRole
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator
+from app.models.enums import UserRole
+
+# Auth schemas are built per request and never mutated
+_FROZEN_CONFIG = ConfigDict(frozen=True)
+
+# Length and charset checked in one pass
+_USERNAME_RE = re.compile(r'[A-Za-z0-9_-]{3,50}\Z')
 
 
 class UserLogin(BaseModel):
     """User login schema"""
-    username: str
-    password: str
+    model_config = _FROZEN_CONFIG
     
-    @validator('username')
-    def username_must_not_be_empty(cls, v):
-        if not v.strip():
-            raise ValueError('Username cannot be empty')
-        return v
-    
-    @validator('password')
-    def password_must_not_be_empty(cls, v):
-        if not v:
-            raise ValueError('Password cannot be empty')
-        return v
+    # Checked inside pydantic-core, with no Python validator callbacks
+    username: str = Field(pattern=r'\S')  # not empty or whitespace-only
+    password: str = Field(min_length=1)
 
 
 class UserRegister(BaseModel):
     """User registration schema"""
+    model_config = _FROZEN_CONFIG
+    
     username: str
     email: EmailStr
     password: str
@@ -35,17 +35,19 @@ class UserRegister(BaseModel):
     last_name: str
     role: UserRole
     
-    @validator('username')
+    @field_validator('username')
+    @classmethod
     def username_validation(cls, v):
+        if _USERNAME_RE.match(v):
+            return v
         if len(v) < 3:
             raise ValueError('Username must be at least 3 characters')
         if len(v) > 50:
             raise ValueError('Username must be less than 50 characters')
-        if not v.replace('_', '').replace('-', '').isalnum():
-            raise ValueError('Username can only contain letters, numbers, hyphens, and underscores')
-        return v
+        raise ValueError('Username can only contain letters, numbers, hyphens, and underscores')
     
-    @validator('password')
+    @field_validator('password')
+    @classmethod
     def password_validation(cls, v):
         if len(v) < 8:
             raise ValueError('Password must be at least 8 characters')
@@ -56,6 +58,8 @@ class UserRegister(BaseModel):
 
 class Token(BaseModel):
     """Token response schema"""
+    model_config = _FROZEN_CONFIG
+    
     access_token: str
     refresh_token: str
     token_type: str
@@ -65,6 +69,8 @@ class Token(BaseModel):
 
 class TokenData(BaseModel):
     """Token data schema"""
+    model_config = _FROZEN_CONFIG
+    
     username: Optional[str] = None
     user_id: Optional[int] = None
     role: Optional[str] = None
@@ -72,10 +78,13 @@ class TokenData(BaseModel):
 
 class PasswordChange(BaseModel):
     """Password change schema"""
+    model_config = _FROZEN_CONFIG
+    
     old_password: str
     new_password: str
     
-    @validator('new_password')
+    @field_validator('new_password')
+    @classmethod
     def new_password_validation(cls, v):
         if len(v) < 8:
             raise ValueError('New password must be at least 8 characters')
@@ -84,10 +93,13 @@ class PasswordChange(BaseModel):
 
 class PasswordReset(BaseModel):
     """Password reset schema"""
+    model_config = _FROZEN_CONFIG
+    
     token: str
     new_password: str
     
-    @validator('new_password')
+    @field_validator('new_password')
+    @classmethod
     def new_password_validation(cls, v):
         if len(v) < 8:
             raise ValueError('New password must be at least 8 characters')
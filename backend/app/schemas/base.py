@@ -0,0 +1,8 @@
+"""
+Shared Schema Configuration
+"""
+
+from pydantic import ConfigDict
+
+# Responses are built server-side and never mutated after construction
+RESPONSE_CONFIG = ConfigDict(frozen=True, extra='ignore')
@@ -3,31 +3,31 @@ Complete Proxy Schemas
 Created: 2025-05-29 12:53:31 UTC by Teeksss
 """
 
-from typing import Any, Dict, List, Optional
-from pydantic import BaseModel, Field, validator
+from typing import Annotated, Any, Dict, List, Literal, Optional
+from pydantic import BaseModel, Field, SkipValidation, StringConstraints
 from datetime import datetime
 from enum import Enum
 
+from app.schemas.query import QueryRequest as _BaseQueryRequest
+from app.schemas.base import RESPONSE_CONFIG
 
-class QueryRequest(BaseModel):
+
+class QueryRequest(_BaseQueryRequest):
     """Schema for query execution request"""
-    query: str = Field(..., min_length=1, max_length=100000, description="SQL query to execute")
-    server_id: int = Field(..., gt=0, description="Target server ID")
-    parameters: Optional[Dict[str, Any]] = Field(default={}, description="Query parameters")
-    timeout: Optional[int] = Field(default=None, ge=1, le=3600, description="Query timeout in seconds")
-    force_refresh: Optional[bool] = Field(default=False, description="Force refresh from database")
-    
-    @validator('query')
-    def validate_query(cls, v):
-        if not v or not v.strip():
-            raise ValueError("Query cannot be empty")
-        return v.strip()
+    # Keeps this endpoint's original length limit and parameters default
+    query: Annotated[str, StringConstraints(strip_whitespace=True, min_length=1, max_length=100000)] = Field(
+        ..., description="SQL query to execute"
+    )
+    parameters: Optional[Dict[str, Any]] = Field(default_factory=dict, description="Query parameters")
 
 
 class QueryResponse(BaseModel):
     """Schema for query execution response"""
+    model_config = RESPONSE_CONFIG
+    
+    # Result rows are opaque; SkipValidation keeps pydantic from walking every cell
     success: bool = Field(..., description="Whether query executed successfully")
-    data: Optional[List[List[Any]]] = Field(default=None, description="Query result data")
+    data: SkipValidation[Optional[List[List[Any]]]] = Field(default=None, repr=False, description="Query result data")
     columns: Optional[List[str]] = Field(default=None, description="Column names")
     row_count: Optional[int] = Field(default=None, description="Number of rows returned")
     execution_time: Optional[float] = Field(default=None, description="Execution time in milliseconds")
@@ -38,11 +38,13 @@ class QueryResponse(BaseModel):
     risk_level: Optional[str] = Field(default=None, description="Query risk level")
     message: Optional[str] = Field(default=None, description="Response message")
     error: Optional[str] = Field(default=None, description="Error message if failed")
-    warnings: Optional[List[str]] = Field(default=[], description="Warning messages")
+    warnings: Optional[List[str]] = Field(default_factory=list, description="Warning messages")
 
 
 class ServerListResponse(BaseModel):
     """Schema for server list response"""
+    model_config = RESPONSE_CONFIG
+    
     id: int = Field(..., description="Server ID")
     name: str = Field(..., description="Server name")
     description: Optional[str] = Field(default=None, description="Server description")
@@ -59,6 +61,8 @@ class ServerListResponse(BaseModel):
 
 class QueryHistoryItem(BaseModel):
     """Schema for query history item"""
+    model_config = RESPONSE_CONFIG
+    
     id: int = Field(..., description="Execution ID")
     query_preview: str = Field(..., description="Query preview (first 100 chars)")
     server_name: str = Field(..., description="Server name")
@@ -71,6 +75,8 @@ class QueryHistoryItem(BaseModel):
 
 class QueryHistoryResponse(BaseModel):
     """Schema for query history response"""
+    model_config = RESPONSE_CONFIG
+    
     items: List[QueryHistoryItem] = Field(..., description="Query history items")
     total: int = Field(..., description="Total number of items")
     skip: int = Field(..., description="Number of items skipped")
@@ -79,13 +85,15 @@ class QueryHistoryResponse(BaseModel):
 
 class QueryTemplateResponse(BaseModel):
     """Schema for query template response"""
+    model_config = RESPONSE_CONFIG
+    
     id: int = Field(..., description="Template ID")
     name: str = Field(..., description="Template name")
     description: Optional[str] = Field(default=None, description="Template description")
     category: Optional[str] = Field(default=None, description="Template category")
     template_sql: str = Field(..., description="SQL template")
-    parameters: List[Dict[str, Any]] = Field(default=[], description="Template parameters")
-    server_types: List[str] = Field(default=[], description="Compatible server types")
+    parameters: List[Dict[str, Any]] = Field(default_factory=list, description="Template parameters")
+    server_types: List[str] = Field(default_factory=list, description="Compatible server types")
     usage_count: int = Field(..., description="Usage count")
 
 
@@ -102,11 +110,13 @@ class QueryExportRequest(BaseModel):
     execution_id: int = Field(..., gt=0, description="Query execution ID")
     format: QueryExportFormat = Field(..., description="Export format")
     include_headers: Optional[bool] = Field(default=True, description="Include column headers")
-    options: Optional[Dict[str, Any]] = Field(default={}, description="Format-specific options")
+    options: Optional[Dict[str, Any]] = Field(default_factory=dict, description="Format-specific options")
 
 
 class ServerTestResponse(BaseModel):
     """Schema for server connection test response"""
+    model_config = RESPONSE_CONFIG
+    
     success: bool = Field(..., description="Whether connection test succeeded")
     message: str = Field(..., description="Test result message")
     response_time_ms: Optional[int] = Field(default=None, description="Connection response time")
@@ -120,12 +130,14 @@ class QueryApprovalRequest(BaseModel):
     query_hash: str = Field(..., description="Query hash")
     original_query: str = Field(..., description="Original query")
     risk_level: str = Field(..., description="Query risk level")
-    tables_used: Optional[List[str]] = Field(default=[], description="Tables accessed")
-    analysis_data: Optional[Dict[str, Any]] = Field(default={}, description="Query analysis data")
+    tables_used: Optional[List[str]] = Field(default_factory=list, description="Tables accessed")
+    analysis_data: Optional[Dict[str, Any]] = Field(default_factory=dict, description="Query analysis data")
 
 
 class QueryApprovalResponse(BaseModel):
     """Schema for query approval response"""
+    model_config = RESPONSE_CONFIG
+    
     id: int = Field(..., description="Approval ID")
     user_id: int = Field(..., description="Requesting user ID")
     username: str = Field(..., description="Requesting username")
@@ -133,37 +145,41 @@ class QueryApprovalResponse(BaseModel):
     original_query: str = Field(..., description="Original query")
     query_type: str = Field(..., description="Query type")
     risk_level: str = Field(..., description="Risk level")
-    tables_used: Optional[List[str]] = Field(default=[], description="Tables used")
+    tables_used: Optional[List[str]] = Field(default_factory=list, description="Tables used")
     created_at: datetime = Field(..., description="Request timestamp")
     status: str = Field(..., description="Approval status")
     approved_by: Optional[str] = Field(default=None, description="Approved by username")
     approved_at: Optional[datetime] = Field(default=None, description="Approval timestamp")
     expires_at: Optional[datetime] = Field(default=None, description="Approval expiry")
     comments: Optional[str] = Field(default=None, description="Approval comments")
-    analysis: Optional[Dict[str, Any]] = Field(default={}, description="Query analysis")
+    analysis: SkipValidation[Optional[Dict[str, Any]]] = Field(default_factory=dict, description="Query analysis")
 
 
 class QueryApprovalDecision(BaseModel):
     """Schema for approval decision"""
-    decision: str = Field(..., regex="^(approve|reject)$", description="Approval decision")
+    decision: Literal["approve", "reject"] = Field(..., description="Approval decision")
     comments: Optional[str] = Field(default=None, max_length=1000, description="Decision comments")
     expires_at: Optional[datetime] = Field(default=None, description="Approval expiry date")
 
 
 class QueryMetrics(BaseModel):
     """Schema for query metrics"""
+    model_config = RESPONSE_CONFIG
+    
     total_queries: int = Field(..., description="Total queries executed")
     successful_queries: int = Field(..., description="Successful queries")
     failed_queries: int = Field(..., description="Failed queries")
     avg_execution_time: float = Field(..., description="Average execution time")
     queries_by_type: Dict[str, int] = Field(..., description="Queries by type")
     queries_by_server: Dict[str, int] = Field(..., description="Queries by server")
-    top_users: List[Dict[str, Any]] = Field(..., description="Top users by query count")
-    slow_queries: List[Dict[str, Any]] = Field(..., description="Slowest queries")
+    top_users: SkipValidation[List[Dict[str, Any]]] = Field(..., description="Top users by query count")
+    slow_queries: SkipValidation[List[Dict[str, Any]]] = Field(..., description="Slowest queries")
 
 
 class ServerMetrics(BaseModel):
     """Schema for server metrics"""
+    model_config = RESPONSE_CONFIG
+    
     server_id: int = Field(..., description="Server ID")
     server_name: str = Field(..., description="Server name")
     total_connections: int = Field(..., description="Total connections")
@@ -176,6 +192,8 @@ class ServerMetrics(BaseModel):
 
 class QueryCacheStats(BaseModel):
     """Schema for query cache statistics"""
+    model_config = RESPONSE_CONFIG
+    
     total_cached: int = Field(..., description="Total cached queries")
     cache_hits: int = Field(..., description="Cache hits")
     cache_misses: int = Field(..., description="Cache misses")
@@ -186,6 +204,8 @@ class QueryCacheStats(BaseModel):
 
 class QueryPerformanceAnalysis(BaseModel):
     """Schema for query performance analysis"""
+    model_config = RESPONSE_CONFIG
+    
     query_hash: str = Field(..., description="Query hash")
     execution_count: int = Field(..., description="Number of executions")
     avg_execution_time: float = Field(..., description="Average execution time")
@@ -198,13 +218,15 @@ class QueryPerformanceAnalysis(BaseModel):
 
 class BulkQueryRequest(BaseModel):
     """Schema for bulk query execution"""
-    queries: List[QueryRequest] = Field(..., max_items=10, description="List of queries to execute")
+    queries: List[QueryRequest] = Field(..., max_length=10, description="List of queries to execute")
     run_in_transaction: Optional[bool] = Field(default=False, description="Run all queries in transaction")
     stop_on_error: Optional[bool] = Field(default=True, description="Stop execution on first error")
 
 
 class BulkQueryResponse(BaseModel):
     """Schema for bulk query execution response"""
+    model_config = RESPONSE_CONFIG
+    
     overall_success: bool = Field(..., description="Whether all queries succeeded")
     results: List[QueryResponse] = Field(..., description="Individual query results")
     total_execution_time: float = Field(..., description="Total execution time")
@@ -218,14 +240,16 @@ class QueryScheduleRequest(BaseModel):
     query: str = Field(..., min_length=1, description="SQL query")
     server_id: int = Field(..., gt=0, description="Target server ID")
     schedule_cron: str = Field(..., description="Cron expression for schedule")
-    parameters: Optional[Dict[str, Any]] = Field(default={}, description="Query parameters")
+    parameters: Optional[Dict[str, Any]] = Field(default_factory=dict, description="Query parameters")
     enabled: Optional[bool] = Field(default=True, description="Whether schedule is enabled")
     email_results: Optional[bool] = Field(default=False, description="Email results")
-    email_recipients: Optional[List[str]] = Field(default=[], description="Email recipients")
+    email_recipients: Optional[List[str]] = Field(default_factory=list, description="Email recipients")
 
 
 class QueryScheduleResponse(BaseModel):
     """Schema for scheduled query response"""
+    model_config = RESPONSE_CONFIG
+    
     id: int = Field(..., description="Schedule ID")
     name: str = Field(..., description="Schedule name")
     query_preview: str = Field(..., description="Query preview")
@@ -260,16 +284,26 @@ class DatabaseSchemaColumn(BaseModel):
     is_foreign_key: Optional[bool] = Field(default=False, description="Whether foreign key")
 
 
+class DatabaseSchemaRoutine(BaseModel):
+    """Schema for stored procedure/function information"""
+    schema: str = Field(..., description="Schema name")
+    name: str = Field(..., description="Routine name")
+
+
 class DatabaseSchemaResponse(BaseModel):
     """Schema for database schema response"""
+    model_config = RESPONSE_CONFIG
+    
     tables: List[DatabaseSchemaTable] = Field(..., description="Database tables")
     views: List[DatabaseSchemaTable] = Field(..., description="Database views")
-    procedures: List[Dict[str, str]] = Field(..., description="Stored procedures")
-    functions: List[Dict[str, str]] = Field(..., description="Database functions")
+    procedures: List[DatabaseSchemaRoutine] = Field(..., description="Stored procedures")
+    functions: List[DatabaseSchemaRoutine] = Field(..., description="Database functions")
 
 
 class TableInfoResponse(BaseModel):
     """Schema for table information response"""
+    model_config = RESPONSE_CONFIG
+    
     schema: str = Field(..., description="Schema name")
     name: str = Field(..., description="Table name")
     type: str = Field(..., description="Table type")
@@ -291,10 +325,12 @@ class QueryValidationRequest(BaseModel):
 
 class QueryValidationResponse(BaseModel):
     """Schema for query validation response"""
+    model_config = RESPONSE_CONFIG
+    
     is_valid: bool = Field(..., description="Whether query is valid")
-    syntax_errors: List[str] = Field(default=[], description="Syntax errors")
-    security_warnings: List[str] = Field(default=[], description="Security warnings")
-    performance_warnings: List[str] = Field(default=[], description="Performance warnings")
-    suggestions: List[str] = Field(default=[], description="Improvement suggestions")
+    syntax_errors: List[str] = Field(default_factory=list, description="Syntax errors")
+    security_warnings: List[str] = Field(default_factory=list, description="Security warnings")
+    performance_warnings: List[str] = Field(default_factory=list, description="Performance warnings")
+    suggestions: List[str] = Field(default_factory=list, description="Improvement suggestions")
     risk_level: str = Field(..., description="Overall risk level")
     complexity_score: float = Field(..., description="Complexity score")
\ No newline at end of file
@@ -3,58 +3,45 @@ Complete Query Schemas - Final Version
 Created: 2025-05-29 14:38:00 UTC by Teeksss
 """
 
-from typing import Optional, Dict, List, Any
+from typing import Annotated, Optional, Dict, List, Any
 from datetime import datetime
-from pydantic import BaseModel, validator
-from app.models.query import QueryType, QueryStatus, RiskLevel
+from pydantic import BaseModel, ConfigDict, Field, SkipValidation, StringConstraints
+from app.models.enums import QueryType, QueryStatus, RiskLevel
+from app.schemas.base import RESPONSE_CONFIG
 
 
 class QueryRequest(BaseModel):
     """Query execution request schema"""
-    query: str
-    server_id: int
+    # Stripped and checked inside pydantic-core, with no Python validator callbacks
+    query: Annotated[str, StringConstraints(strip_whitespace=True, min_length=1, max_length=1000000)]
+    server_id: int = Field(gt=0)
     parameters: Optional[Dict[str, Any]] = None
-    timeout: Optional[int] = None
-    max_rows: Optional[int] = None
+    timeout: Optional[int] = Field(default=None, ge=1, le=3600)
+    max_rows: Optional[int] = Field(default=None, ge=1, le=100000)
     use_cache: bool = True
-    
-    @validator('query')
-    def query_validation(cls, v):
-        if not v.strip():
-            raise ValueError('Query cannot be empty')
-        if len(v) > 1000000:  # 1MB
-            raise ValueError('Query is too large')
-        return v
-    
-    @validator('timeout')
-    def timeout_validation(cls, v):
-        if v is not None and (v < 1 or v > 3600):
-            raise ValueError('Timeout must be between 1 and 3600 seconds')
-        return v
-    
-    @validator('max_rows')
-    def max_rows_validation(cls, v):
-        if v is not None and (v < 1 or v > 100000):
-            raise ValueError('Max rows must be between 1 and 100000')
-        return v
 
 
 class QueryResponse(BaseModel):
     """Query execution response schema"""
+    model_config = RESPONSE_CONFIG
+    
+    # Result rows are opaque; SkipValidation keeps pydantic from walking every cell
     success: bool
     execution_id: Optional[int]
-    data: Optional[List[List[Any]]] = None
+    data: SkipValidation[Optional[List[List[Any]]]] = Field(default=None, repr=False)
     columns: Optional[List[str]] = None
     row_count: int = 0
     rows_affected: int = 0
     execution_time_ms: int
     cached: bool = False
     error: Optional[str] = None
-    analysis: Optional[Dict[str, Any]] = None
+    analysis: SkipValidation[Optional[Dict[str, Any]]] = None
 
 
 class QueryHistoryResponse(BaseModel):
     """Query history response schema"""
+    model_config = RESPONSE_CONFIG
+    
     id: int
     server_id: int
     server_name: str
@@ -73,28 +60,18 @@ class QueryHistoryResponse(BaseModel):
 
 class QueryTemplateCreate(BaseModel):
     """Query template creation schema"""
-    name: str
+    name: str = Field(min_length=3)
     description: Optional[str] = None
-    query_template: str
+    query_template: str = Field(pattern=r'\S')  # not empty or whitespace-only
     category: Optional[str] = None
     parameters: Optional[Dict[str, Any]] = None
     is_public: bool = False
-    
-    @validator('name')
-    def name_validation(cls, v):
-        if len(v) < 3:
-            raise ValueError('Template name must be at least 3 characters')
-        return v
-    
-    @validator('query_template')
-    def template_validation(cls, v):
-        if not v.strip():
-            raise ValueError('Query template cannot be empty')
-        return v
 
 
 class QueryTemplateResponse(BaseModel):
     """Query template response schema"""
+    model_config = ConfigDict(**RESPONSE_CONFIG, from_attributes=True)
+    
     id: int
     name: str
     description: Optional[str]
@@ -107,13 +84,12 @@ class QueryTemplateResponse(BaseModel):
     created_at: datetime
     updated_at: Optional[datetime]
     usage_count: int
-    
-    class Config:
-        from_attributes = True
 
 
 class QueryAnalysisResponse(BaseModel):
     """Query analysis response schema"""
+    model_config = RESPONSE_CONFIG
+    
     valid: bool
     query_type: QueryType
     risk_level: RiskLevel
@@ -124,5 +100,5 @@ class QueryAnalysisResponse(BaseModel):
     performance_issues: List[Dict[str, Any]]
     compliance_issues: List[Dict[str, Any]]
     requires_approval: bool
-    metadata: Dict[str, Any]
+    metadata: SkipValidation[Dict[str, Any]]
     error: Optional[str] = None
\ No newline at end of file
@@ -5,17 +5,17 @@ Created: 2025-05-29 14:38:00 UTC by Teeksss
 
 from typing import Optional, List
 from datetime import datetime
-from pydantic import BaseModel, validator
-from app.models.sql_server import ServerType, Environment, HealthStatus
-from app.models.user import UserRole
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field, SkipValidation
+from app.models.enums import ServerType, Environment, HealthStatus, UserRole
+from app.schemas.base import RESPONSE_CONFIG
 
 
 class ServerBase(BaseModel):
     """Base server schema"""
-    name: str
+    name: str = Field(min_length=3)
     server_type: ServerType
     host: str
-    port: int
+    port: int = Field(ge=1, le=65535)
     database: str
     username: str
     environment: Environment
@@ -23,29 +23,11 @@ class ServerBase(BaseModel):
     is_read_only: bool = False
     max_connections: Optional[int] = 10
     connection_timeout: Optional[int] = 30
-    
-    @validator('name')
-    def name_validation(cls, v):
-        if len(v) < 3:
-            raise ValueError('Server name must be at least 3 characters')
-        return v
-    
-    @validator('port')
-    def port_validation(cls, v):
-        if v < 1 or v > 65535:
-            raise ValueError('Port must be between 1 and 65535')
-        return v
 
 
 class ServerCreate(ServerBase):
     """Server creation schema"""
-    password: str
-    
-    @validator('password')
-    def password_validation(cls, v):
-        if len(v) < 1:
-            raise ValueError('Password cannot be empty')
-        return v
+    password: str = Field(min_length=1)
 
 
 class ServerUpdate(BaseModel):
@@ -66,6 +48,8 @@ class ServerUpdate(BaseModel):
 
 class ServerResponse(BaseModel):
     """Server response schema"""
+    model_config = ConfigDict(**RESPONSE_CONFIG, from_attributes=True)
+    
     id: int
     name: str
     server_type: ServerType
@@ -83,35 +67,8 @@ class ServerResponse(BaseModel):
     last_health_check: Optional[datetime]
     created_at: datetime
     updated_at: Optional[datetime]
-    created_by_id: Optional[int]
+    created_by_id: Optional[int] = Field(validation_alias=AliasChoices("created_by_id", "created_by"))
     allowed_roles: Optional[List[UserRole]]
-    
-    class Config:
-        from_attributes = True
-        
-    @classmethod
-    def from_orm(cls, obj):
-        return cls(
-            id=obj.id,
-            name=obj.name,
-            server_type=obj.server_type,
-            host=obj.host,
-            port=obj.port,
-            database=obj.database,
-            username=obj.username,
-            environment=obj.environment,
-            description=obj.description,
-            is_read_only=obj.is_read_only,
-            max_connections=obj.max_connections,
-            connection_timeout=obj.connection_timeout,
-            is_active=obj.is_active,
-            health_status=obj.health_status,
-            last_health_check=obj.last_health_check,
-            created_at=obj.created_at,
-            updated_at=obj.updated_at,
-            created_by_id=obj.created_by_id,
-            allowed_roles=obj.allowed_roles
-        )
 
 
 class ServerHealth(BaseModel):
@@ -121,4 +78,4 @@ class ServerHealth(BaseModel):
     response_time_ms: Optional[int]
     error_message: Optional[str]
     last_check: datetime
-    details: Optional[dict]
\ No newline at end of file
+    details: SkipValidation[Optional[dict]]
\ No newline at end of file
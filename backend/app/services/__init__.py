@@ -3,8 +3,9 @@ Complete Services Package - Final Version
 Created: 2025-05-29 14:38:00 UTC by Teeksss
 """
 
+import asyncio
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 
 from .auth import AuthService
 from .sql_proxy import SQLProxyService
@@ -17,6 +18,9 @@ from .audit import AuditService
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on any single service's health_check
+HEALTH_CHECK_TIMEOUT = 5  # seconds
+
 # Service instances
 services = {
     'auth': None,
@@ -29,60 +33,48 @@ services = {
     'audit': None
 }
 
+# Startup order. Each group depends only on the groups before it:
+#   cache -> rate_limiter, audit, auth, query_analyzer, notification
+#         -> sql_proxy -> health (monitors the others)
+# Services within a group are initialized concurrently.
+_INITIALIZATION_GROUPS = [
+    {'cache': CacheService},
+    {
+        'rate_limiter': RateLimiterService,
+        'audit': AuditService,
+        'auth': AuthService,
+        'query_analyzer': QueryAnalyzer,
+        'notification': NotificationService
+    },
+    {'sql_proxy': SQLProxyService},
+    {'health': HealthService},
+]
+
 
 async def initialize_all_services() -> bool:
-    """Initialize all services"""
+    """Initialize all services, group by group (see _INITIALIZATION_GROUPS)"""
     
     try:
         logger.info("🚀 Initializing all services...")
         
-        # Initialize Cache Service first (others depend on it)
-        logger.info("📦 Initializing Cache Service...")
-        cache_service = CacheService()
-        await cache_service.initialize()
-        services['cache'] = cache_service
-        
-        # Initialize Rate Limiter Service
-        logger.info("🚦 Initializing Rate Limiter Service...")
-        rate_limiter_service = RateLimiterService()
-        await rate_limiter_service.initialize()
-        services['rate_limiter'] = rate_limiter_service
-        
-        # Initialize Audit Service
-        logger.info("📋 Initializing Audit Service...")
-        audit_service = AuditService()
-        await audit_service.initialize()
-        services['audit'] = audit_service
-        
-        # Initialize Auth Service
-        logger.info("🔐 Initializing Auth Service...")
-        auth_service = AuthService()
-        await auth_service.initialize()
-        services['auth'] = auth_service
-        
-        # Initialize Query Analyzer
-        logger.info("🔍 Initializing Query Analyzer...")
-        query_analyzer = QueryAnalyzer()
-        await query_analyzer.initialize()
-        services['query_analyzer'] = query_analyzer
-        
-        # Initialize SQL Proxy Service
-        logger.info("🗄️ Initializing SQL Proxy Service...")
-        sql_proxy_service = SQLProxyService()
-        await sql_proxy_service.initialize()
-        services['sql_proxy'] = sql_proxy_service
-        
-        # Initialize Notification Service
-        logger.info("📧 Initializing Notification Service...")
-        notification_service = NotificationService()
-        await notification_service.initialize()
-        services['notification'] = notification_service
-        
-        # Initialize Health Service last (monitors others)
-        logger.info("💚 Initializing Health Service...")
-        health_service = HealthService()
-        await health_service.initialize()
-        services['health'] = health_service
+        for group in _INITIALIZATION_GROUPS:
+            instances = {service_name: service_class() for service_name, service_class in group.items()}
+            logger.info(f"📦 Initializing {', '.join(instances)}...")
+            
+            results = await asyncio.gather(
+                *(service.initialize() for service in instances.values()),
+                return_exceptions=True
+            )
+            
+            # Register what came up so shutdown can clean it, then fail on the first error
+            errors = []
+            for (service_name, service), result in zip(instances.items(), results):
+                if isinstance(result, BaseException):
+                    errors.append(result)
+                else:
+                    services[service_name] = service
+            if errors:
+                raise errors[0]
         
         logger.info("✅ All services initialized successfully")
         return True
@@ -120,26 +112,35 @@ async def shutdown_all_services():
         logger.error(f"❌ Service shutdown failed: {e}")
 
 
-async def get_services_health() -> Dict[str, Any]:
-    """Get health status of all services"""
+async def _service_health(service_name: str, service) -> Tuple[str, Dict[str, Any]]:
+    """Run one service's health check, bounded by HEALTH_CHECK_TIMEOUT"""
     
-    health_status = {}
+    if not service:
+        return service_name, {"status": "not_initialized"}
     
-    for service_name, service in services.items():
-        if service:
-            try:
-                health_status[service_name] = await service.health_check()
-            except Exception as e:
-                health_status[service_name] = {
-                    "status": "unhealthy",
-                    "error": str(e)
-                }
-        else:
-            health_status[service_name] = {
-                "status": "not_initialized"
-            }
+    try:
+        return service_name, await asyncio.wait_for(service.health_check(), HEALTH_CHECK_TIMEOUT)
+    except asyncio.TimeoutError:
+        return service_name, {
+            "status": "timeout",
+            "check": service_name,
+            "error": f"health check exceeded {HEALTH_CHECK_TIMEOUT}s"
+        }
+    except Exception as e:
+        return service_name, {
+            "status": "unhealthy",
+            "error": str(e)
+        }
+
+
+async def get_services_health() -> Dict[str, Any]:
+    """Get health status of all services, checked concurrently"""
     
-    return health_status
+    results = await asyncio.gather(*(
+        _service_health(service_name, service)
+        for service_name, service in services.items()
+    ))
+    return dict(results)
 
 
 async def get_services_metrics() -> Dict[str, Any]:
@@ -5,45 +5,162 @@ Created: 2025-05-29 14:30:36 UTC by Teeksss
 
 import logging
 import asyncio
-import json
-from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+import orjson
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Any, Optional, Set, Tuple
+from dataclasses import dataclass
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, asc
+from sqlalchemy import and_, or_, desc, asc, delete, insert, select, text
+from cachetools import TTLCache
 
 from app.core.config import settings
-from app.core.database import get_db_session
-from app.models.audit import AuditLog
+from app.core.database import drop_expired_partitions, ensure_monthly_partitions, get_db_session
+from app.models.audit import AuditLog, AuditStatus
+from app.models.types import JSONText
 from app.models.user import User
 from app.services.cache import cache_service
 from app.services.notification import notification_service
 
 logger = logging.getLogger(__name__)
 
+# Entries written per transaction, and how long to wait to fill a batch
+AUDIT_BATCH_SIZE = 200
+AUDIT_BATCH_WINDOW = 0.1  # seconds
+
+# Recent IPs remembered per user, mirrored to Redis for other processes
+USER_IPS_TTL = 86400  # seconds
+USER_IPS_KEPT = 5
+USER_IPS_LOCAL_MAX = 100_000
+USER_IPS_WRITE_CONCURRENCY = 16
+
+# Security alerts waiting for delivery; further alerts are dropped and counted
+AUDIT_ALERT_QUEUE_MAX = 1000
+
+# Retention cleanup deletes in short transactions, pausing between them
+AUDIT_CLEANUP_CHUNK = 5000
+AUDIT_CLEANUP_PAUSE = 0.5  # seconds
+
+_SEVERITY_LEVELS = {"info": 1, "warning": 2, "error": 3, "critical": 4}
+
+_ESCALATION_ACTIONS = frozenset({
+    "user_role_changed",
+    "user_permissions_modified",
+    "admin_access_attempted",
+    "system_config_modified"
+})
+
+# Base risk by action type; unknown actions score 10
+_ACTION_RISKS = {
+    "login_failed": 20,
+    "login_success": 5,
+    "logout": 0,
+    "password_changed": 15,
+    "user_created": 30,
+    "user_deleted": 50,
+    "role_changed": 40,
+    "query_executed": 10,
+    "query_failed": 25,
+    "server_added": 35,
+    "server_deleted": 60,
+    "config_changed": 45,
+    "admin_access": 25
+}
+
+# Planner row estimate for a table plus its partitions; an exact COUNT(*)
+# scans every row of a long-retention audit table
+_ESTIMATED_ROWS_SQL = text(
+    "SELECT COALESCE(SUM(GREATEST(c.reltuples, 0)), 0)::bigint FROM pg_class c "
+    "WHERE c.oid = CAST(:table AS regclass) "
+    "OR c.oid IN (SELECT inhrelid FROM pg_inherits WHERE inhparent = CAST(:table AS regclass))"
+)
+
+# RFC 1918 ranges (10/8, 172.16/12, 192.168/16); anything else is external
+_PRIVATE_PREFIXES = ("10.", "192.168.") + tuple(f"172.{octet}." for octet in range(16, 32))
+
+
+@dataclass(frozen=True, slots=True)
+class SuspiciousPattern:
+    """Suspicious activity pattern, pre-processed for per-event matching"""
+    name: str
+    min_severity_level: int
+    details_items: Tuple[Tuple[str, Any], ...]
+    
+    def matches(self, severity_level: int, details: Dict[str, Any]) -> bool:
+        return severity_level >= self.min_severity_level and all(
+            key in details and details[key] == expected for key, expected in self.details_items
+        )
+
+
+@dataclass(slots=True)
+class AuditEvent:
+    """Audit log entry on its way from log_event to the batch writer
+
+    Field names are AuditLog columns, so as_row() is the insert row as-is.
+    """
+    action: str
+    status: str
+    user_id: Optional[int]
+    username: Optional[str]  # looked up by the batch writer when not given
+    ip_address: Optional[str]
+    user_agent: Optional[str]
+    resource_type: Optional[str]
+    resource_id: Optional[str]
+    details: Any  # dict until log_event serializes it to JSONText
+    severity: str
+    category: str
+    session_id: Optional[str]
+    created_at: datetime
+    risk_score: int
+    is_suspicious: bool = False
+    alert_triggered: bool = False
+    
+    def as_row(self) -> Dict[str, Any]:
+        """Insert parameters for this entry"""
+        return {name: getattr(self, name) for name in self.__slots__}
+
 
 class AuditService:
     """Complete Audit Logging Service"""
     
     def __init__(self):
-        self.audit_queue = asyncio.Queue()
+        # Bounded so a burst cannot grow memory without limit; see log_event
+        self.audit_queue = asyncio.Queue(maxsize=settings.AUDIT_QUEUE_MAX)
+        # Alerts are delivered by their own worker so a slow notification
+        # backend never holds up audit writes
+        self.alert_queue = asyncio.Queue(maxsize=AUDIT_ALERT_QUEUE_MAX)
         self.stats = {
             "total_logs": 0,
             "security_events": 0,
             "query_events": 0,
             "admin_events": 0,
             "suspicious_events": 0,
-            "alerts_triggered": 0
+            "alerts_triggered": 0,
+            "alerts_dropped": 0,
+            "dropped": 0,
+            "queue_high_water": 0,
+            "worker_restarts": 0
         }
         self.suspicious_patterns = self._load_suspicious_patterns()
+        self._patterns_by_action, self._patterns_any_action = self._index_patterns(self.suspicious_patterns)
+        # Log counts reported by health_check, reused across frequent probes
+        self._log_counts = TTLCache(maxsize=1, ttl=settings.HEALTH_CACHE_TTL)
+        # Per-process copy of each user's recent IPs; Redis is only read on a miss
+        self._user_ips = TTLCache(maxsize=USER_IPS_LOCAL_MAX, ttl=USER_IPS_TTL)
+        self._user_ips_writes: Set[asyncio.Task] = set()
+        self._user_ips_write_slots = asyncio.Semaphore(USER_IPS_WRITE_CONCURRENCY)
+        # Background tasks by name; held here so they are not garbage collected
+        self._tasks: Dict[str, asyncio.Task] = {}
         
     async def initialize(self):
         """Initialize audit service"""
         try:
-            # Start audit processing worker
-            asyncio.create_task(self._audit_worker())
-            
-            # Start cleanup task
-            asyncio.create_task(self._cleanup_old_logs())
+            # Start the audit processing worker and the cleanup task, each
+            # restarted if it crashes
+            self._tasks = {
+                "audit_worker": asyncio.create_task(self._supervised("audit_worker", self._audit_worker)),
+                "audit_cleanup": asyncio.create_task(self._supervised("audit_cleanup", self._cleanup_old_logs)),
+                "alert_worker": asyncio.create_task(self._supervised("alert_worker", self._alert_worker))
+            }
             
             logger.info("✅ Audit Service initialized")
             
@@ -62,36 +179,55 @@ class AuditService:
         details: Optional[Dict[str, Any]] = None,
         severity: str = "info",
         category: str = "general",
-        session_id: Optional[str] = None
+        session_id: Optional[str] = None,
+        username: Optional[str] = None,
+        status: Optional[str] = None
     ) -> int:
-        """Log audit event"""
+        """Log audit event (status defaults to failed for *_failed actions, else success)"""
         
         try:
+            if status is None:
+                status = AuditStatus.FAILED if action.endswith("_failed") else AuditStatus.SUCCESS
+            
             # Create audit log entry
-            audit_data = {
-                "action": action,
-                "user_id": user_id,
-                "ip_address": ip_address,
-                "user_agent": user_agent,
-                "resource_type": resource_type,
-                "resource_id": resource_id,
-                "details": details or {},
-                "severity": severity,
-                "category": category,
-                "session_id": session_id,
-                "timestamp": datetime.utcnow(),
-                "risk_score": self._calculate_risk_score(action, details, ip_address),
-                "is_suspicious": False,
-                "alert_triggered": False
-            }
+            event = AuditEvent(
+                action=action,
+                status=AuditStatus(status).value,
+                user_id=user_id,
+                username=username,
+                ip_address=ip_address,
+                user_agent=user_agent,
+                resource_type=resource_type,
+                resource_id=resource_id,
+                details=details or {},
+                severity=severity,
+                category=category,
+                session_id=session_id,
+                created_at=datetime.now(timezone.utc),
+                risk_score=self._calculate_risk_score(action, details, ip_address)
+            )
             
             # Check for suspicious activity
-            audit_data["is_suspicious"] = await self._check_suspicious_activity(audit_data)
+            event.is_suspicious = await self._check_suspicious_activity(event)
             
-            # Queue for processing
-            await self.audit_queue.put(audit_data)
+            # Serialize here, on the caller, so the batch writer only does I/O
+            event.details = JSONText(
+                orjson.dumps(event.details, option=orjson.OPT_NON_STR_KEYS, default=str).decode()
+            )
+            
+            # Queue for processing; when the writer is saturated, drop and
+            # count rather than stall the request or grow without bound
+            try:
+                self.audit_queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self.stats["dropped"] += 1
+                logger.warning(f"Audit queue full, dropped {action} event ({self.stats['dropped']} dropped so far)")
+                return 0
             
             self.stats["total_logs"] += 1
+            queue_size = self.audit_queue.qsize()
+            if queue_size > self.stats["queue_high_water"]:
+                self.stats["queue_high_water"] = queue_size
             
             # Update category stats
             if category == "security":
@@ -101,7 +237,7 @@ class AuditService:
             elif category == "admin":
                 self.stats["admin_events"] += 1
             
-            if audit_data["is_suspicious"]:
+            if event.is_suspicious:
                 self.stats["suspicious_events"] += 1
             
             return 1  # Placeholder for audit log ID
@@ -110,62 +246,70 @@ class AuditService:
             logger.error(f"Audit logging error: {e}")
             return 0
     
-    async def _process_audit_entry(self, audit_data: Dict[str, Any]):
-        """Process individual audit entry"""
+    async def _process_audit_batch(self, batch: List[AuditEvent]):
+        """Persist a batch of audit entries in one transaction, then queue alerts"""
+        
+        for event in batch:
+            event.alert_triggered = event.is_suspicious or event.risk_score > 80
         
         try:
             with get_db_session() as db:
-                # Create audit log record
-                audit_log = AuditLog(
-                    action=audit_data["action"],
-                    user_id=audit_data["user_id"],
-                    ip_address=audit_data["ip_address"],
-                    user_agent=audit_data["user_agent"],
-                    resource_type=audit_data["resource_type"],
-                    resource_id=audit_data["resource_id"],
-                    details=audit_data["details"],
-                    severity=audit_data["severity"],
-                    category=audit_data["category"],
-                    session_id=audit_data["session_id"],
-                    timestamp=audit_data["timestamp"],
-                    risk_score=audit_data["risk_score"],
-                    is_suspicious=audit_data["is_suspicious"],
-                    alert_triggered=audit_data["alert_triggered"]
-                )
+                self._fill_usernames(db, batch)
                 
-                db.add(audit_log)
+                # Plain Core executemany: audit rows are write-only, so the
+                # ORM unit of work buys nothing here
+                db.execute(insert(AuditLog.__table__), [event.as_row() for event in batch])
                 db.commit()
-                db.refresh(audit_log)
-                
-                # Trigger alerts if necessary
-                if audit_data["is_suspicious"] or audit_data["risk_score"] > 80:
-                    await self._trigger_security_alert(audit_log)
-                
-                logger.debug(f"Audit log {audit_log.id} processed successfully")
-                
         except Exception as e:
-            logger.error(f"Process audit entry error: {e}")
+            logger.error(f"Process audit batch error ({len(batch)} entries): {e}")
+            return
+        
+        logger.debug(f"Audit batch of {len(batch)} entries processed successfully")
+        
+        for event in batch:
+            if event.alert_triggered:
+                try:
+                    self.alert_queue.put_nowait(event)
+                except asyncio.QueueFull:
+                    self.stats["alerts_dropped"] += 1
+                    logger.warning(f"Alert queue full, dropped alert for {event.action}")
+    
+    @staticmethod
+    def _fill_usernames(db: Session, batch: List[AuditEvent]):
+        """Set the username column, which is NOT NULL, with one lookup per batch"""
+        
+        user_ids = {event.user_id for event in batch if event.username is None and event.user_id}
+        usernames = dict(
+            db.execute(select(User.id, User.username).where(User.id.in_(user_ids))).all()
+        ) if user_ids else {}
+        
+        for event in batch:
+            if event.username is None:
+                event.username = usernames.get(event.user_id, "unknown") if event.user_id else "anonymous"
     
-    async def _check_suspicious_activity(self, audit_data: Dict[str, Any]) -> bool:
+    async def _check_suspicious_activity(self, event: AuditEvent) -> bool:
         """Check if activity is suspicious"""
         
         try:
-            # Check against suspicious patterns
-            for pattern_name, pattern_config in self.suspicious_patterns.items():
-                if self._matches_pattern(audit_data, pattern_config):
-                    logger.warning(f"Suspicious activity detected: {pattern_name}")
-                    return True
+            # Check against the patterns that apply to this action
+            severity_level = _SEVERITY_LEVELS.get(event.severity, 1)
+            details = event.details
+            for patterns in (self._patterns_by_action.get(event.action, ()), self._patterns_any_action):
+                for pattern in patterns:
+                    if pattern.matches(severity_level, details):
+                        logger.warning(f"Suspicious activity detected: {pattern.name}")
+                        return True
             
             # Check for rapid repeated actions
-            if await self._check_rapid_actions(audit_data):
+            if await self._check_rapid_actions(event):
                 return True
             
             # Check for unusual IP activity
-            if await self._check_unusual_ip_activity(audit_data):
+            if await self._check_unusual_ip_activity(event):
                 return True
             
             # Check for privilege escalation attempts
-            if self._check_privilege_escalation(audit_data):
+            if self._check_privilege_escalation(event):
                 return True
             
             return False
@@ -174,111 +318,71 @@ class AuditService:
             logger.error(f"Suspicious activity check error: {e}")
             return False
     
-    def _matches_pattern(self, audit_data: Dict[str, Any], pattern_config: Dict[str, Any]) -> bool:
-        """Check if audit data matches suspicious pattern"""
-        
-        try:
-            # Check action pattern
-            if "actions" in pattern_config:
-                if audit_data["action"] not in pattern_config["actions"]:
-                    return False
-            
-            # Check severity
-            if "min_severity" in pattern_config:
-                severity_levels = {"info": 1, "warning": 2, "error": 3, "critical": 4}
-                if severity_levels.get(audit_data["severity"], 1) < severity_levels.get(pattern_config["min_severity"], 1):
-                    return False
-            
-            # Check details pattern
-            if "details_pattern" in pattern_config:
-                details = audit_data.get("details", {})
-                for key, expected_value in pattern_config["details_pattern"].items():
-                    if key not in details or details[key] != expected_value:
-                        return False
-            
-            return True
-            
-        except Exception as e:
-            logger.error(f"Pattern matching error: {e}")
-            return False
-    
-    async def _check_rapid_actions(self, audit_data: Dict[str, Any]) -> bool:
+    async def _check_rapid_actions(self, event: AuditEvent) -> bool:
         """Check for rapid repeated actions"""
         
         try:
-            if not audit_data["user_id"]:
+            user_id = event.user_id
+            if not user_id:
                 return False
             
-            # Check for repeated actions in last 5 minutes
-            cache_key = f"rapid_actions:{audit_data['user_id']}:{audit_data['action']}"
-            current_count = await cache_service.get(cache_key, 0)
+            # Count this action in a 5 minute window (atomic, one round-trip)
+            cache_key = f"rapid_actions:{user_id}:{event.action}"
+            count = await cache_service.incr_with_ttl(cache_key, 300)
             
-            if current_count >= 10:  # More than 10 actions in 5 minutes
-                return True
-            
-            # Increment counter
-            await cache_service.set(cache_key, current_count + 1, ttl=300)
-            
-            return False
+            return count is not None and count > 10  # More than 10 actions in 5 minutes
             
         except Exception as e:
             logger.error(f"Rapid actions check error: {e}")
             return False
     
-    async def _check_unusual_ip_activity(self, audit_data: Dict[str, Any]) -> bool:
+    async def _check_unusual_ip_activity(self, event: AuditEvent) -> bool:
         """Check for unusual IP activity"""
         
         try:
-            if not audit_data["ip_address"] or not audit_data["user_id"]:
+            ip_address = event.ip_address
+            user_id = event.user_id
+            if not ip_address or not user_id:
                 return False
             
-            # Get user's recent IP addresses
-            cache_key = f"user_ips:{audit_data['user_id']}"
-            recent_ips = await cache_service.get(cache_key, [])
+            # Get user's recent IP addresses, from this process when possible
+            recent_ips = self._user_ips.get(user_id)
+            if recent_ips is None:
+                recent_ips = await cache_service.get(f"user_ips:{user_id}", [])
+                self._user_ips[user_id] = recent_ips
             
-            # If new IP and user has been active from other IPs recently
-            if (audit_data["ip_address"] not in recent_ips and 
-                len(recent_ips) > 0 and 
-                len(recent_ips) < 5):  # Not too many IPs (could be legitimate)
-                
-                # Add current IP to recent IPs
-                recent_ips.append(audit_data["ip_address"])
-                if len(recent_ips) > 5:
-                    recent_ips = recent_ips[-5:]  # Keep only last 5 IPs
-                
-                await cache_service.set(cache_key, recent_ips, ttl=86400)  # 24 hours
-                
-                return True
+            if ip_address in recent_ips:
+                return False
             
-            # Update recent IPs
-            if audit_data["ip_address"] not in recent_ips:
-                recent_ips.append(audit_data["ip_address"])
-                if len(recent_ips) > 5:
-                    recent_ips = recent_ips[-5:]
-                await cache_service.set(cache_key, recent_ips, ttl=86400)
+            # New IP while the user has been active from a few others recently
+            # (many IPs could be legitimate, e.g. a roaming user)
+            unusual = 0 < len(recent_ips) < USER_IPS_KEPT
             
-            return False
+            recent_ips = (recent_ips + [ip_address])[-USER_IPS_KEPT:]
+            self._user_ips[user_id] = recent_ips
+            self._write_user_ips(user_id, recent_ips)
+            
+            return unusual
             
         except Exception as e:
             logger.error(f"Unusual IP activity check error: {e}")
             return False
     
-    def _check_privilege_escalation(self, audit_data: Dict[str, Any]) -> bool:
+    def _write_user_ips(self, user_id: int, recent_ips: List[str]):
+        """Mirror a user's recent IPs to Redis without making the caller wait"""
+        
+        async def write():
+            async with self._user_ips_write_slots:
+                await cache_service.set(f"user_ips:{user_id}", recent_ips, ttl=USER_IPS_TTL)
+        
+        task = asyncio.create_task(write())
+        self._user_ips_writes.add(task)
+        task.add_done_callback(self._user_ips_writes.discard)
+    
+    def _check_privilege_escalation(self, event: AuditEvent) -> bool:
         """Check for privilege escalation attempts"""
         
-        try:
-            escalation_actions = [
-                "user_role_changed",
-                "user_permissions_modified",
-                "admin_access_attempted",
-                "system_config_modified"
-            ]
-            
-            return audit_data["action"] in escalation_actions
-            
-        except Exception as e:
-            logger.error(f"Privilege escalation check error: {e}")
-            return False
+        return event.action in _ESCALATION_ACTIONS
     
     def _calculate_risk_score(
         self, 
@@ -288,86 +392,53 @@ class AuditService:
     ) -> int:
         """Calculate risk score for action"""
         
-        try:
-            risk_score = 0
-            
-            # Base risk by action type
-            action_risks = {
-                "login_failed": 20,
-                "login_success": 5,
-                "logout": 0,
-                "password_changed": 15,
-                "user_created": 30,
-                "user_deleted": 50,
-                "role_changed": 40,
-                "query_executed": 10,
-                "query_failed": 25,
-                "server_added": 35,
-                "server_deleted": 60,
-                "config_changed": 45,
-                "admin_access": 25
-            }
-            
-            risk_score += action_risks.get(action, 10)
-            
-            # Risk based on details
-            if details:
-                if details.get("failed_attempts", 0) > 3:
-                    risk_score += 30
-                
-                if details.get("privilege_escalation"):
-                    risk_score += 40
-                
-                if details.get("system_access"):
-                    risk_score += 20
-                
-                if details.get("data_modification"):
-                    risk_score += 15
+        risk_score = _ACTION_RISKS.get(action, 10)
+        
+        # Risk based on details
+        if details:
+            if details.get("failed_attempts", 0) > 3:
+                risk_score += 30
             
-            # Risk based on IP (simplified check)
-            if ip_address:
-                # Check if IP is from known suspicious ranges
-                suspicious_ranges = ["10.0.0.", "192.168.", "172.16."]
-                if not any(ip_address.startswith(range_) for range_ in suspicious_ranges):
-                    risk_score += 10  # External IP
+            if details.get("privilege_escalation"):
+                risk_score += 40
             
-            return min(risk_score, 100)  # Cap at 100
+            if details.get("system_access"):
+                risk_score += 20
             
-        except Exception as e:
-            logger.error(f"Risk score calculation error: {e}")
-            return 50  # Default medium risk
+            if details.get("data_modification"):
+                risk_score += 15
+        
+        # Risk based on IP (simplified check)
+        if ip_address and not ip_address.startswith(_PRIVATE_PREFIXES):
+            risk_score += 10  # External IP
+        
+        return min(risk_score, 100)  # Cap at 100
     
-    async def _trigger_security_alert(self, audit_log: AuditLog):
+    async def _trigger_security_alert(self, event: AuditEvent):
         """Trigger security alert for suspicious activity"""
         
         try:
-            # Mark alert as triggered
-            audit_log.alert_triggered = True
-            
-            # Send notification
-            alert_message = f"""
-            🚨 Security Alert Detected
-            
-            Action: {audit_log.action}
-            User: {audit_log.user.username if audit_log.user else 'Unknown'}
-            IP Address: {audit_log.ip_address}
-            Risk Score: {audit_log.risk_score}
-            Timestamp: {audit_log.timestamp}
-            
-            Details: {json.dumps(audit_log.details, indent=2)}
-            """
+            alert_message = "\n".join((
+                "🚨 Security Alert Detected",
+                f"Action: {event.action}",
+                f"User ID: {event.user_id or 'Unknown'}",
+                f"IP Address: {event.ip_address}",
+                f"Risk Score: {event.risk_score}",
+                f"Timestamp: {event.created_at.isoformat()}",
+                f"Details: {event.details}"
+            ))
             
             await notification_service.send_notification(
                 notification_type="security_alert",
                 recipients=["admin@company.com"],  # Configure admin emails
-                subject=f"Security Alert: {audit_log.action}",
+                subject=f"Security Alert: {event.action}",
                 message=alert_message,
                 priority="high"
             )
             
             self.stats["alerts_triggered"] += 1
             
-            logger.warning(f"Security alert triggered for audit log {audit_log.id}")
+            logger.warning(f"Security alert triggered for {event.action} by user {event.user_id}")
             
         except Exception as e:
             logger.error(f"Security alert trigger error: {e}")
@@ -403,6 +474,29 @@ class AuditService:
             }
         }
     
+    @staticmethod
+    def _index_patterns(
+        patterns: Dict[str, Dict[str, Any]]
+    ) -> Tuple[Dict[str, List[SuspiciousPattern]], List[SuspiciousPattern]]:
+        """Group patterns by the actions they watch; patterns without actions watch all"""
+        
+        by_action: Dict[str, List[SuspiciousPattern]] = {}
+        any_action: List[SuspiciousPattern] = []
+        
+        for name, config in patterns.items():
+            pattern = SuspiciousPattern(
+                name=name,
+                min_severity_level=_SEVERITY_LEVELS.get(config.get("min_severity"), 1),
+                details_items=tuple(config.get("details_pattern", {}).items())
+            )
+            if "actions" in config:
+                for action in config["actions"]:
+                    by_action.setdefault(action, []).append(pattern)
+            else:
+                any_action.append(pattern)
+        
+        return by_action, any_action
+    
     async def _cleanup_old_logs(self):
         """Cleanup old audit logs periodically"""
         
@@ -410,69 +504,169 @@ class AuditService:
             try:
                 await asyncio.sleep(86400)  # Run daily
                 
+                # Keep monthly partitions ahead of the clock for long-running
+                # processes, so new rows never pile up in the default partition
+                await asyncio.to_thread(ensure_monthly_partitions)
+                
                 if settings.AUDIT_RETENTION_DAYS > 0:
-                    cutoff_date = datetime.utcnow() - timedelta(days=settings.AUDIT_RETENTION_DAYS)
+                    # Whole expired months go first (partitioned tables only);
+                    # the chunked delete below handles the rest
+                    dropped = await asyncio.to_thread(drop_expired_partitions, settings.AUDIT_RETENTION_DAYS)
+                    if dropped:
+                        logger.info(f"Dropped {dropped} expired audit log partitions")
                     
-                    with get_db_session() as db:
-                        deleted_count = db.query(AuditLog).filter(
-                            AuditLog.timestamp < cutoff_date
-                        ).delete()
+                    cutoff_date = datetime.now(timezone.utc) - timedelta(days=settings.AUDIT_RETENTION_DAYS)
+                    expired_ids = (
+                        select(AuditLog.id)
+                        .where(AuditLog.created_at < cutoff_date)
+                        .order_by(AuditLog.id)
+                        .limit(AUDIT_CLEANUP_CHUNK)
+                    )
+                    
+                    deleted_count = 0
+                    while True:
+                        with get_db_session() as db:
+                            deleted = db.execute(
+                                delete(AuditLog).where(AuditLog.id.in_(expired_ids)),
+                                execution_options={"synchronize_session": False}
+                            ).rowcount
+                            db.commit()
                         
-                        db.commit()
+                        deleted_count += deleted
+                        if deleted < AUDIT_CLEANUP_CHUNK:
+                            break
                         
-                        if deleted_count > 0:
-                            logger.info(f"Cleaned up {deleted_count} old audit logs")
+                        # Let the audit worker commit its batches between chunks
+                        await asyncio.sleep(AUDIT_CLEANUP_PAUSE)
+                    
+                    if deleted_count > 0:
+                        logger.info(f"Cleaned up {deleted_count} old audit logs")
                 
             except Exception as e:
                 logger.error(f"Audit cleanup error: {e}")
     
+    async def _supervised(self, name: str, worker):
+        """Run a background worker forever, restarting it after a crash"""
+        
+        while True:
+            try:
+                await worker()
+                logger.warning(f"{name} exited, restarting in 1s")
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception(f"{name} crashed, restarting in 1s")
+            
+            self.stats["worker_restarts"] += 1
+            await asyncio.sleep(1)
+    
+    def _task_alive(self, name: str) -> bool:
+        task = self._tasks.get(name)
+        return task is not None and not task.done()
+    
+    async def _stop_task(self, name: str):
+        task = self._tasks.pop(name, None)
+        if task:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+    
+    async def _alert_worker(self):
+        """Background worker delivering security alerts"""
+        
+        while True:
+            event = await self.alert_queue.get()
+            try:
+                await self._trigger_security_alert(event)
+            finally:
+                self.alert_queue.task_done()
+    
     async def _audit_worker(self):
         """Background worker for audit processing"""
         
+        loop = asyncio.get_running_loop()
+        
         while True:
+            batch = []
             try:
-                # Get audit data from queue
-                audit_data = await self.audit_queue.get()
+                # Wait for the first entry, then keep collecting for a short
+                # window so a burst is written in one transaction
+                batch.append(await self.audit_queue.get())
+                deadline = loop.time() + AUDIT_BATCH_WINDOW
                 
-                # Process audit entry
-                await self._process_audit_entry(audit_data)
+                while len(batch) < AUDIT_BATCH_SIZE:
+                    # Take whatever is already queued without suspending;
+                    # only wait (and so yield) once the queue runs dry
+                    try:
+                        batch.append(self.audit_queue.get_nowait())
+                        continue
+                    except asyncio.QueueEmpty:
+                        pass
+                    
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self.audit_queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
                 
-                # Mark task as done
-                self.audit_queue.task_done()
+                await self._process_audit_batch(batch)
                 
             except Exception as e:
                 logger.error(f"Audit worker error: {e}")
                 await asyncio.sleep(1)
+            
+            finally:
+                # Mark tasks as done so cleanup()'s join() can complete
+                for _ in batch:
+                    self.audit_queue.task_done()
     
     async def health_check(self) -> Dict[str, Any]:
         """Service health check"""
         
+        now = datetime.now(timezone.utc)
+        
         try:
             queue_size = self.audit_queue.qsize()
             
-            with get_db_session() as db:
-                total_logs = db.query(AuditLog).count()
-                recent_logs = db.query(AuditLog).filter(
-                    AuditLog.timestamp > datetime.utcnow() - timedelta(hours=24)
-                ).count()
+            counts = self._log_counts.get("counts")
+            if counts is None:
+                counts = self._log_counts["counts"] = self._count_logs(now)
+            total_logs, recent_logs = counts
             
             return {
                 "status": "healthy",
                 "queue_size": queue_size,
+                "worker_alive": self._task_alive("audit_worker"),
                 "total_logs": total_logs,
                 "recent_logs_24h": recent_logs,
                 "patterns_loaded": len(self.suspicious_patterns),
                 "stats": self.stats,
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": now.isoformat()
             }
             
         except Exception as e:
             return {
                 "status": "unhealthy",
                 "error": str(e),
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": now.isoformat()
             }
     
+    def _count_logs(self, now: datetime) -> Tuple[int, int]:
+        """Total (estimated on PostgreSQL) and last-24h audit log counts"""
+        
+        with get_db_session() as db:
+            if db.get_bind().dialect.name == "postgresql":
+                total_logs = db.execute(_ESTIMATED_ROWS_SQL, {"table": AuditLog.__tablename__}).scalar()
+            else:
+                total_logs = db.query(AuditLog).count()
+            
+            recent_logs = db.query(AuditLog).filter(
+                AuditLog.created_at > now - timedelta(hours=24)
+            ).count()
+        
+        return total_logs, recent_logs
+    
     async def get_metrics(self) -> Dict[str, Any]:
         """Get audit metrics"""
         
@@ -480,15 +674,28 @@ class AuditService:
             "stats": self.stats,
             "patterns": list(self.suspicious_patterns.keys()),
             "queue_size": self.audit_queue.qsize(),
+            "worker_alive": self._task_alive("audit_worker"),
             "retention_days": settings.AUDIT_RETENTION_DAYS,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": datetime.now(timezone.utc).isoformat()
         }
     
     async def cleanup(self):
         """Cleanup service resources"""
         
-        # Wait for queue to empty
-        await self.audit_queue.join()
+        await self._stop_task("audit_cleanup")
+        
+        # Drain the audit queue, then the alerts it produced; each worker
+        # must still be running for its queue to empty
+        if self._task_alive("audit_worker"):
+            await self.audit_queue.join()
+        await self._stop_task("audit_worker")
+        
+        if self._task_alive("alert_worker"):
+            await self.alert_queue.join()
+        await self._stop_task("alert_worker")
+        
+        # Let pending recent-IP writes reach Redis
+        await asyncio.gather(*self._user_ips_writes, return_exceptions=True)
         
         logger.info("✅ Audit Service cleanup completed")
 
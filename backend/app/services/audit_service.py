@@ -1,4 +1,3 @@
-import json
 import logging
 from typing import Dict, Any, Optional, List
 from datetime import datetime, timedelta
@@ -50,19 +49,12 @@ class AuditService:
                 user_agent=user_agent,
                 session_id=session_id,
                 status=status,
-                duration_ms=duration_ms
+                duration_ms=duration_ms,
+                details=details or None,
+                old_values=old_values or None,
+                new_values=new_values or None
             )
             
-            # Set details
-            if details:
-                audit_log.set_details(details)
-            
-            if old_values:
-                audit_log.old_values = json.dumps(old_values)
-            
-            if new_values:
-                audit_log.new_values = json.dumps(new_values)
-            
             self.db.add(audit_log)
             self.db.commit()
             
@@ -96,12 +88,10 @@ class AuditService:
                 source_user_id=source_user_id,
                 source_username=source_username,
                 detection_method=detection_method,
-                rule_name=rule_name
+                rule_name=rule_name,
+                details=details or None
             )
             
-            if details:
-                security_event.details = json.dumps(details)
-            
             self.db.add(security_event)
             self.db.commit()
             
@@ -140,9 +130,9 @@ class AuditService:
                 table_name=table_name,
                 record_id=record_id,
                 operation=operation,
-                old_values=json.dumps(old_values) if old_values else None,
-                new_values=json.dumps(new_values) if new_values else None,
-                changed_fields=json.dumps(changed_fields),
+                old_values=old_values or None,
+                new_values=new_values or None,
+                changed_fields=changed_fields,
                 changed_by=changed_by,
                 change_reason=change_reason,
                 ip_address=ip_address,
@@ -218,7 +208,7 @@ class AuditService:
                     "ip_address": log.ip_address,
                     "user_agent": log.user_agent,
                     "duration_ms": log.duration_ms,
-                    "details": log.get_details(),
+                    "details": log.details or {},
                     "created_at": log.created_at.isoformat()
                 })
             
@@ -390,14 +380,8 @@ class AuditService:
             event.resolved_by = resolved_by
             event.resolved_at = datetime.utcnow()
             
-            # Add resolution notes to actions_taken
-            actions = []
-            if event.actions_taken:
-                try:
-                    actions = json.loads(event.actions_taken)
-                except json.JSONDecodeError:
-                    actions = []
-            
+            # Add resolution notes to actions_taken (new list so the change is tracked)
+            actions = list(event.actions_taken or [])
             actions.append({
                 "action": "resolved",
                 "by": resolved_by,
@@ -405,7 +389,7 @@ class AuditService:
                 "notes": resolution_notes
             })
             
-            event.actions_taken = json.dumps(actions)
+            event.actions_taken = actions
             
             self.db.commit()
             
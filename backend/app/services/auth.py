@@ -6,7 +6,8 @@ Created: 2025-05-29 14:18:32 UTC by Teeksss
 import hashlib
 import secrets
 import logging
-from datetime import datetime, timedelta
+import time
+from datetime import datetime, timedelta, timezone
 from typing import Optional, Dict, Any, List
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
@@ -24,10 +25,23 @@ from app.core.security import (
 )
 from app.models.user import User, UserSession, UserRole, UserStatus
 from app.models.audit import AuditLog
+from app.services.cache import cache_service
 
 logger = logging.getLogger(__name__)
 
 
+def _session_key(user_id: int) -> str:
+    """Redis sorted set of a user's live session ids, scored by expiry"""
+    return f"sessions:{user_id}"
+
+
+def _expiry_score(expires_at: datetime) -> float:
+    """Epoch seconds for a session expiry; naive values are stored as UTC"""
+    if expires_at.tzinfo is None:
+        expires_at = expires_at.replace(tzinfo=timezone.utc)
+    return expires_at.astimezone(timezone.utc).timestamp()
+
+
 class AuthService:
     """Complete Authentication Service"""
     
@@ -112,6 +126,23 @@ class AuthService:
                     detail="Account is locked"
                 )
             
+            # Enforce the concurrent session limit (skipped if Redis is down)
+            active_sessions = await cache_service.zprune_count(_session_key(user.id), time.time())
+            if active_sessions is not None and user.max_sessions and active_sessions >= user.max_sessions:
+                log_security_event(
+                    "login_failed",
+                    user_id=user.id,
+                    ip_address=ip_address,
+                    details={
+                        "username": username,
+                        "reason": "max_sessions_reached"
+                    }
+                )
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="Maximum number of active sessions reached"
+                )
+            
             # Clear failed attempts on successful auth
             self._clear_failed_attempts(username, ip_address)
             
@@ -153,6 +184,12 @@ class AuthService:
             
             db.commit()
             
+            await cache_service.zadd(
+                _session_key(user.id),
+                {session.session_id: _expiry_score(session.expires_at)},
+                ttl=settings.SESSION_TIMEOUT_MINUTES * 60
+            )
+            
             return {
                 "access_token": access_token,
                 "refresh_token": refresh_token,
@@ -250,6 +287,12 @@ class AuthService:
             )
             
             db.commit()
+            
+            if session_id:
+                await cache_service.zrem(_session_key(user_id), session_id)
+            else:
+                await cache_service.delete(_session_key(user_id))
+            
             return True
     
     async def change_password(
@@ -303,6 +346,9 @@ class AuthService:
             )
             
             db.commit()
+            
+            # The revoked sessions must stop counting towards max_sessions
+            await cache_service.delete(_session_key(user_id))
             return True
     
     async def reset_password_request(self, email: str) -> str:
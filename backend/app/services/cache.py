@@ -232,6 +232,26 @@ class CacheService:
             self.stats["errors"] += 1
             return None
     
+    async def incr_with_ttl(self, key: str, ttl: int) -> Optional[int]:
+        """Atomically increment a counter, starting its TTL on first use"""
+        try:
+            if not self.is_connected:
+                return None
+            
+            prefixed_key = self._add_prefix(key)
+            
+            # One round-trip; NX keeps later increments from extending the window
+            pipe = self.redis_client.pipeline()
+            pipe.incr(prefixed_key)
+            pipe.expire(prefixed_key, ttl, nx=True)
+            count, _ = pipe.execute()
+            return count
+            
+        except Exception as e:
+            logger.error(f"Cache INCR error for key {key}: {e}")
+            self.stats["errors"] += 1
+            return None
+    
     async def decrement(self, key: str, amount: int = 1) -> Optional[int]:
         """Decrement numeric value"""
         try:
@@ -335,6 +355,67 @@ class CacheService:
             self.stats["errors"] += 1
             return 0
     
+    async def zadd(
+        self,
+        key: str,
+        mapping: Dict[str, float],
+        ttl: Optional[int] = None
+    ) -> bool:
+        """Add members with scores to a sorted set"""
+        try:
+            if not self.is_connected or not mapping:
+                return False
+            
+            prefixed_key = self._add_prefix(key)
+            
+            pipe = self.redis_client.pipeline()
+            pipe.zadd(prefixed_key, mapping)
+            if ttl:
+                pipe.expire(prefixed_key, ttl)
+            pipe.execute()
+            
+            self.stats["sets"] += 1
+            return True
+            
+        except Exception as e:
+            logger.error(f"Cache ZADD error for key {key}: {e}")
+            self.stats["errors"] += 1
+            return False
+    
+    async def zrem(self, key: str, *members: str) -> int:
+        """Remove members from a sorted set"""
+        try:
+            if not self.is_connected or not members:
+                return 0
+            
+            removed = self.redis_client.zrem(self._add_prefix(key), *members)
+            self.stats["deletes"] += removed
+            return removed
+            
+        except Exception as e:
+            logger.error(f"Cache ZREM error for key {key}: {e}")
+            self.stats["errors"] += 1
+            return 0
+    
+    async def zprune_count(self, key: str, min_score: float) -> Optional[int]:
+        """Drop sorted-set members scored below min_score and count the rest"""
+        try:
+            if not self.is_connected:
+                return None
+            
+            prefixed_key = self._add_prefix(key)
+            
+            pipe = self.redis_client.pipeline()
+            pipe.zremrangebyscore(prefixed_key, "-inf", f"({min_score}")
+            pipe.zcard(prefixed_key)
+            _, remaining = pipe.execute()
+            return remaining
+            
+        except Exception as e:
+            logger.error(f"Cache ZCARD error for key {key}: {e}")
+            self.stats["errors"] += 1
+            return None
+    
     async def clear_pattern(self, pattern: str) -> int:
         """Clear all keys matching pattern"""
         try:
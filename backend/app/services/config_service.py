@@ -196,10 +196,9 @@ class ConfigService:
                 return {"valid": False, "error": f"Invalid {config.config_type.value}: {str(e)}"}
             
             # Allowed values validation
-            if config.allowed_values:
-                allowed = json.loads(config.allowed_values)
-                if value not in allowed:
-                    return {"valid": False, "error": f"Value must be one of: {', '.join(map(str, allowed))}"}
+            if not config.is_allowed_value(value):
+                allowed_list = json.loads(config.allowed_values)
+                return {"valid": False, "error": f"Value must be one of: {', '.join(map(str, allowed_list))}"}
             
             # Regex validation
             if config.validation_regex:
@@ -7,7 +7,7 @@ from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 
-from app.models.server import SQLServerConnection, ServerHealthHistory
+from app.models.sql_server import SQLServerConnection, ServerHealthHistory, HealthStatus
 from app.models.audit import SecurityEvent
 from app.services.config_service import ConfigService
 
@@ -164,7 +164,7 @@ class HealthService:
             
             # Update server health in database
             server.last_health_check = datetime.utcnow()
-            server.health_status = status
+            server.health_status = HealthStatus(status)
             server.health_message = message
             server.response_time_ms = response_time
             
@@ -304,14 +304,14 @@ class HealthService:
             # Check for server health issues
             unhealthy_servers = self.db.query(SQLServerConnection).filter(
                 SQLServerConnection.is_active == True,
-                SQLServerConnection.health_status.in_(["unhealthy", "critical"])
+                SQLServerConnection.health_status == HealthStatus.UNHEALTHY
             ).all()
             
             for server in unhealthy_servers:
                 alerts.append({
                     "type": "server_health",
-                    "severity": "high" if server.health_status == "critical" else "medium",
-                    "message": f"Server {server.name} is {server.health_status}: {server.health_message}",
+                    "severity": "medium",
+                    "message": f"Server {server.name} is {server.health_status.value}: {server.health_message}",
                     "occurred_at": server.last_health_check.isoformat() if server.last_health_check else None,
                     "server_id": server.id
                 })
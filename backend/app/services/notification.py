@@ -321,8 +321,8 @@ class NotificationService:
                 delivery.sent_at = datetime.utcnow()
                 db.commit()
                 
-                # Parse recipients
-                recipients = json.loads(delivery.recipients) if isinstance(delivery.recipients, str) else [delivery.recipients]
+                # Recipients are stored as a list
+                recipients = delivery.recipients or []
                 
                 # Send based on channel
                 success = False
@@ -409,7 +409,7 @@ class NotificationService:
                     notification_type=notification_type,
                     channel=channel,
                     priority=priority,
-                    recipients=json.dumps(recipients),
+                    recipients=list(recipients),
                     subject=subject,
                     message=message,
                     template_name=template_name,
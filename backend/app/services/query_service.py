@@ -9,7 +9,7 @@ from datetime import datetime
 
 from app.models.query import QueryWhitelist, QueryExecution
 from app.models.audit import AuditLog
-from app.models.server import SQLServerConnection
+from app.models.sql_server import SQLServerConnection
 from app.utils.sql_parser import SQLParser
 from app.services.config_service import ConfigService
 
@@ -225,6 +225,8 @@ class QueryService:
             ).first()
             
             if whitelist_entry:
+                if not QueryWhitelist.record_execution(self.db, whitelist_entry.id):
+                    return {"allowed": False, "reason": "Approved query has reached its execution limit"}
                 return {"allowed": True, "reason": "Query approved"}
             
             # Check pattern-based rules
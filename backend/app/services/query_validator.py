@@ -71,4 +71,4 @@ class QueryValidator:
     def get_query_hash(self, query: str) -> str:
         """Generate hash for query caching/logging"""
         normalized_query = self._normalize_query(query)
-        return hashlib.md5(normalized_query.encode()).hexdigest()
\ No newline at end of file
+        return hashlib.sha256(normalized_query.encode()).hexdigest()
\ No newline at end of file
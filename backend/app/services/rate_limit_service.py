@@ -138,16 +138,17 @@ class RateLimitService:
             await self._increment_counter(hour_key, 3600)  # Expire after 1 hour
             await self._increment_counter(day_key, 86400)  # Expire after 1 day
             
-            # Record in database for analytics
-            execution = RateLimitExecution(
+            # Record in database for analytics (one counter row per minute)
+            window_start = current_time.replace(second=0, microsecond=0)
+            RateLimitExecution.bump(
+                self.db,
                 target_type="user",
                 target_value=str(user_id),
-                window_start=current_time,
-                window_end=current_time + timedelta(minutes=1),
+                window_start=window_start,
+                window_end=window_start + timedelta(minutes=1),
                 ip_address=ip_address,
                 endpoint="query_execution"
             )
-            self.db.add(execution)
             self.db.commit()
             
             return True
@@ -15,6 +15,7 @@ from sqlalchemy import create_engine, text, MetaData
 from sqlalchemy.pool import StaticPool
 from sqlalchemy.exc import SQLAlchemyError
 import pandas as pd
+from cachetools import TTLCache
 
 from app.core.config import settings
 from app.core.database import get_db_session
@@ -46,6 +47,10 @@ class SQLProxyService:
             "total_connections": 0
         }
         self.query_analyzer = None
+        # Server health snapshots served to request paths; refreshed by the
+        # background monitor and by successful queries instead of live probes
+        self.health_cache = TTLCache(maxsize=1024, ttl=60)
+        self.last_success = {}
         
     async def initialize(self):
         """Initialize SQL proxy service"""
@@ -122,7 +127,6 @@ class SQLProxyService:
                     server_id=server_id,
                     original_query=query,
                     normalized_query=analysis_result["metadata"]["normalized_query"],
-                    query_preview=query[:200] + "..." if len(query) > 200 else query,
                     query_type=analysis_result["query_type"],
                     status=QueryStatus.PENDING,
                     risk_level=analysis_result["risk_level"],
@@ -349,6 +353,9 @@ class SQLProxyService:
                 timeout=timeout
             )
             
+            if result["success"]:
+                self.last_success[server.id] = time.monotonic()
+            
             return result
             
         except asyncio.TimeoutError:
@@ -431,7 +438,9 @@ class SQLProxyService:
     async def _get_connection_pool(self, server: SQLServerConnection):
         """Get or create connection pool for server"""
         
-        pool_key = f"{server.id}_{server.host}_{server.port}_{server.database}"
+        # updated_at is part of the key so edited pool settings take effect
+        version = int(server.updated_at.timestamp()) if server.updated_at else 0
+        pool_key = f"{server.id}_{server.host}_{server.port}_{server.database}_{version}"
         
         if pool_key in self.connection_pools:
             return self.connection_pools[pool_key]
@@ -440,13 +449,14 @@ class SQLProxyService:
             # Create connection string
             connection_string = self._build_connection_string(server)
             
-            # Create engine with connection pool
+            # Create engine with the server's own pool settings
+            pool_size = server.pool_size or 5
             engine = create_engine(
                 connection_string,
-                pool_size=server.max_connections or 10,
-                max_overflow=20,
-                pool_timeout=30,
-                pool_recycle=3600,
+                pool_size=pool_size,
+                max_overflow=min(server.max_overflow if server.max_overflow is not None else 10, 4 * pool_size),
+                pool_timeout=server.pool_timeout or 30,
+                pool_recycle=min(server.pool_recycle or 3600, 3600),
                 pool_pre_ping=True,
                 echo=settings.DEBUG
             )
@@ -455,6 +465,10 @@ class SQLProxyService:
             with engine.connect() as conn:
                 conn.execute(text("SELECT 1"))
             
+            # Retire pools built from an older version of this server
+            for stale_key in [key for key in self.connection_pools if key.startswith(f"{server.id}_")]:
+                self.connection_pools.pop(stale_key).dispose()
+            
             self.connection_pools[pool_key] = engine
             self.stats["total_connections"] += 1
             
@@ -609,11 +623,21 @@ class SQLProxyService:
                 
                 # Check each connection pool
                 for pool_key, engine in list(self.connection_pools.items()):
+                    server_id = int(pool_key.split("_", 1)[0])
                     try:
+                        start_time = time.time()
                         with engine.connect() as conn:
                             conn.execute(text("SELECT 1"))
+                        self.health_cache[server_id] = self._health_snapshot("healthy", {
+                            "connection": "ok",
+                            "response_time_ms": int((time.time() - start_time) * 1000)
+                        })
                         logger.debug(f"Connection pool {pool_key} is healthy")
                     except Exception as e:
+                        self.health_cache[server_id] = self._health_snapshot("unhealthy", {
+                            "connection": "failed",
+                            "error": str(e)
+                        })
                         logger.warning(f"Connection pool {pool_key} is unhealthy: {e}")
                         # Remove unhealthy pool
                         del self.connection_pools[pool_key]
@@ -665,8 +689,18 @@ class SQLProxyService:
                 "error": str(e)
             }
     
-    async def get_server_health(self, server_id: int) -> Dict[str, Any]:
-        """Get server health status"""
+    async def get_server_health(self, server_id: int, refresh: bool = False) -> Dict[str, Any]:
+        """Get server health status, probing the server only when no recent snapshot exists"""
+        
+        if not refresh:
+            cached = self.health_cache.get(server_id)
+            if cached is not None:
+                return cached
+            
+            # A query that succeeded within the TTL is proof enough of liveness
+            last_success = self.last_success.get(server_id)
+            if last_success is not None and time.monotonic() - last_success < self.health_cache.ttl:
+                return self._health_snapshot("healthy", {"connection": "ok", "source": "recent_query"})
         
         try:
             connection_test = await self.test_server_connection(server_id)
@@ -684,18 +718,21 @@ class SQLProxyService:
                     "error": connection_test["error"]
                 }
             
-            return {
-                "status": status,
-                "details": details,
-                "timestamp": datetime.utcnow().isoformat()
-            }
+            snapshot = self._health_snapshot(status, details)
             
         except Exception as e:
-            return {
-                "status": "unhealthy",
-                "details": {"error": str(e)},
-                "timestamp": datetime.utcnow().isoformat()
-            }
+            snapshot = self._health_snapshot("unhealthy", {"error": str(e)})
+        
+        self.health_cache[server_id] = snapshot
+        return snapshot
+    
+    @staticmethod
+    def _health_snapshot(status: str, details: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "status": status,
+            "details": details,
+            "timestamp": datetime.utcnow().isoformat()
+        }
     
     async def health_check(self) -> Dict[str, Any]:
         """Service health check"""
@@ -3,9 +3,11 @@ Complete Utilities Package - Final Version
 Created: 2025-05-29 14:38:00 UTC by Teeksss
 """
 
+import ipaddress
 import logging
 import sys
-from typing import Any, Dict
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
 from datetime import datetime
 
 
@@ -186,6 +188,40 @@ def get_client_ip(request_headers: Dict[str, str]) -> str:
     return "unknown"
 
 
+@lru_cache(maxsize=8)
+def _proxy_networks(trusted_proxies: Tuple[str, ...]):
+    return tuple(ipaddress.ip_network(proxy, strict=False) for proxy in trusted_proxies)
+
+
+def get_trusted_client_ip(
+    peer_ip: Optional[str],
+    request_headers: Mapping[str, str],
+    trusted_proxies: Iterable[str]
+) -> Optional[str]:
+    """Resolve the client IP, believing X-Forwarded-For only from trusted proxies
+    
+    Hops are read right to left and the first address that is not a trusted
+    proxy is the client, so a spoofed left-most entry is never used.
+    """
+    networks = _proxy_networks(tuple(trusted_proxies))
+    
+    def is_trusted(ip: str) -> bool:
+        try:
+            address = ipaddress.ip_address(ip)
+        except ValueError:
+            return False
+        return any(address in network for network in networks)
+    
+    if not peer_ip or not is_trusted(peer_ip):
+        return peer_ip
+    
+    hops = [hop.strip() for hop in request_headers.get('x-forwarded-for', '').split(',') if hop.strip()]
+    for hop in reversed(hops):
+        if not is_trusted(hop):
+            return hop
+    return request_headers.get('x-real-ip', peer_ip)
+
+
 def create_error_response(
     error_code: str,
     message: str,
@@ -201,4 +201,30 @@ class TestSecurityAPI:
             responses.append(response.status_code)
         
         # Should hit rate limit
-        assert 429 in responses
\ No newline at end of file
+        assert 429 in responses
+
+class TestSystemEndpoints:
+    """Test unauthenticated system endpoints and global middleware"""
+    
+    def test_request_id_headers(self, client):
+        """Test that API responses carry request ID and timing headers"""
+        response = client.get("/version")
+        assert response.status_code == 200
+        assert response.headers["X-Request-ID"].startswith("req_")
+        assert response.headers["X-Response-Time"].endswith("s")
+        assert response.headers["X-API-Version"] == "2.0.0"
+    
+    def test_health_skips_request_id_headers(self, client):
+        """Test that health probes skip request ID bookkeeping"""
+        response = client.get("/health")
+        assert response.status_code == 200
+        assert "X-Request-ID" not in response.headers
+    
+    def test_drivers_payload(self, client):
+        """Test that the cached drivers payload keeps its shape"""
+        response = client.get("/drivers")
+        assert response.status_code == 200
+        data = response.json()
+        assert set(data["drivers"]) == {"postgresql", "mysql", "redis"}
+        assert isinstance(data["timestamp"], float)
+        assert data["version"] == "2.0.0"
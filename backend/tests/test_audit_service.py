@@ -0,0 +1,49 @@
+"""
+Audit Service Tests
+"""
+
+import asyncio
+from contextlib import contextmanager
+from unittest.mock import AsyncMock, patch
+
+from app.models.audit import AuditLog
+from app.models.user import User
+from app.services.audit import AuditService
+
+
+def test_audit_batch_is_written(db_session):
+    """Entries queued by log_event are inserted with every NOT NULL column set"""
+    user = User(username="auditor", email="auditor@example.com", hashed_password="x")
+    db_session.add(user)
+    db_session.commit()
+
+    @contextmanager
+    def test_session():
+        yield db_session
+
+    service = AuditService()
+
+    async def log_and_flush():
+        await service.log_event("login_failed", user_id=user.id, details={"attempt": 1}, category="security")
+        await service.log_event("logout")
+        batch = [service.audit_queue.get_nowait() for _ in range(service.audit_queue.qsize())]
+        await service._process_audit_batch(batch)
+
+    with patch("app.services.audit.get_db_session", test_session), \
+            patch("app.services.audit.cache_service") as cache:
+        cache.get = AsyncMock(return_value=[])
+        cache.set = AsyncMock(return_value=True)
+        cache.incr_with_ttl = AsyncMock(return_value=1)
+        asyncio.run(log_and_flush())
+
+    rows = {row.action: row for row in db_session.query(AuditLog).all()}
+    assert set(rows) == {"login_failed", "logout"}
+
+    assert rows["login_failed"].username == "auditor"
+    assert rows["login_failed"].status == "failed"
+    assert rows["login_failed"].category == "security"
+    assert rows["login_failed"].details == {"attempt": 1}
+    assert rows["login_failed"].created_at is not None
+
+    assert rows["logout"].username == "anonymous"
+    assert rows["logout"].status == "success"
@@ -0,0 +1,33 @@
+"""
+Config Service Tests
+"""
+
+import asyncio
+
+from app.models.config import ConfigType, SystemConfig
+from app.services.config_service import ConfigService
+
+
+def test_json_config_allowed_values(db_session):
+    """JSON arrays are checked against allowed_values instead of failing validation"""
+    db_session.add_all([
+        SystemConfig(key="pairs", name="Pairs", config_type=ConfigType.JSON,
+                     allowed_values="[[1, 2], [3, 4]]"),
+        SystemConfig(key="levels", name="Levels", config_type=ConfigType.JSON,
+                     allowed_values="[1, 2, 3]"),
+    ])
+    db_session.commit()
+
+    service = ConfigService(db_session)
+
+    assert asyncio.run(service.validate_config("pairs", [1, 2])) == {"valid": True}
+
+    result = asyncio.run(service.validate_config("pairs", [5]))
+    assert result["valid"] is False
+    assert result["error"].startswith("Value must be one of:")
+
+    assert asyncio.run(service.validate_config("levels", 2)) == {"valid": True}
+
+    result = asyncio.run(service.validate_config("levels", [1]))
+    assert result["valid"] is False
+    assert result["error"].startswith("Value must be one of:")
@@ -0,0 +1,32 @@
+"""
+Model Tests
+"""
+
+import pytest
+
+from app.models.user import User
+
+
+@pytest.mark.parametrize("first_name, last_name, display_name", [
+    ("Jane", "Doe", None),
+    ("Jane", None, "JD"),
+    ("", "Doe", ""),
+    ("", "", "JD"),
+    (None, None, None),
+])
+def test_full_name_cached_matches_hybrid(db_session, first_name, last_name, display_name):
+    """The computed column and the Python full_name agree, including on empty strings"""
+    user = User(
+        username="bob",
+        email="bob@example.com",
+        hashed_password="x",
+        first_name=first_name,
+        last_name=last_name,
+        display_name=display_name,
+    )
+    db_session.add(user)
+    db_session.commit()
+    db_session.refresh(user)
+
+    assert user.full_name_cached == user.full_name
+    assert db_session.query(User.full_name).scalar() == user.full_name
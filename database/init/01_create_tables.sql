@@ -5,6 +5,9 @@
 -- Enable UUID extension
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
 
+-- Trigram operator classes for substring search indexes
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
 -- Create enum types
 CREATE TYPE user_role AS ENUM ('admin', 'analyst', 'powerbi', 'readonly');
 CREATE TYPE server_type AS ENUM ('mssql', 'mysql', 'postgresql', 'oracle');
@@ -31,7 +34,7 @@ CREATE TABLE users (
     last_login TIMESTAMP WITH TIME ZONE,
     login_count INTEGER DEFAULT 0,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP WITH TIME ZONE,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     created_by VARCHAR(100)
 );
 
@@ -62,7 +65,7 @@ CREATE TABLE user_preferences (
     email_notifications BOOLEAN DEFAULT true,
     preferences JSONB,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP WITH TIME ZONE,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     UNIQUE(user_id)
 );
 
@@ -76,10 +79,7 @@ CREATE TABLE system_configs (
     config_type config_type NOT NULL DEFAULT 'string',
     value TEXT,
     default_value TEXT,
-    is_sensitive BOOLEAN NOT NULL DEFAULT false,
-    requires_restart BOOLEAN NOT NULL DEFAULT false,
-    is_readonly BOOLEAN NOT NULL DEFAULT false,
-    is_advanced BOOLEAN NOT NULL DEFAULT false,
+    flags SMALLINT NOT NULL DEFAULT 0, -- 1 sensitive, 2 requires restart, 4 readonly, 8 advanced
     validation_regex TEXT,
     min_value NUMERIC,
     max_value NUMERIC,
@@ -87,7 +87,7 @@ CREATE TABLE system_configs (
     ui_component VARCHAR(100),
     ui_props JSONB,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP WITH TIME ZONE
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
 -- Configuration change history
@@ -146,7 +146,7 @@ CREATE TABLE rate_limit_rules (
 
 -- Rate limit execution tracking
 CREATE TABLE rate_limit_executions (
-    id SERIAL PRIMARY KEY,
+    id BIGSERIAL PRIMARY KEY,
     target_type VARCHAR(50) NOT NULL,
     target_value VARCHAR(200) NOT NULL,
     window_start TIMESTAMP WITH TIME ZONE NOT NULL,
@@ -154,7 +154,8 @@ CREATE TABLE rate_limit_executions (
     request_count INTEGER NOT NULL DEFAULT 1,
     ip_address INET,
     endpoint VARCHAR(200),
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT uq_rle_window UNIQUE (target_type, target_value, window_start)
 );
 
 -- SQL Server connections
@@ -192,7 +193,7 @@ CREATE TABLE sql_server_connections (
     health_message TEXT,
     response_time_ms INTEGER,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP WITH TIME ZONE,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     created_by VARCHAR(100)
 );
 
@@ -210,10 +211,20 @@ CREATE TABLE server_health_history (
     checked_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Client IP ranges allowed to use a server (no rows = unrestricted)
+CREATE TABLE server_ip_whitelist (
+    id SERIAL PRIMARY KEY,
+    server_id INTEGER NOT NULL REFERENCES sql_server_connections(id) ON DELETE CASCADE,
+    cidr CIDR NOT NULL,
+    description TEXT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    created_by VARCHAR(100)
+);
+
 -- Query whitelist
 CREATE TABLE query_whitelist (
     id SERIAL PRIMARY KEY,
-    query_hash VARCHAR(64) UNIQUE NOT NULL,
+    query_hash BYTEA UNIQUE NOT NULL, -- raw SHA-256 digest
     original_query TEXT NOT NULL,
     normalized_query TEXT NOT NULL,
     query_type VARCHAR(50) NOT NULL,
@@ -236,14 +247,14 @@ CREATE TABLE query_whitelist (
 
 -- Query execution history
 CREATE TABLE query_executions (
-    id SERIAL PRIMARY KEY,
-    query_hash VARCHAR(64),
+    id BIGSERIAL PRIMARY KEY,
+    query_hash BYTEA, -- raw SHA-256 digest
     user_id INTEGER NOT NULL REFERENCES users(id),
     server_id INTEGER NOT NULL REFERENCES sql_server_connections(id),
     session_id UUID REFERENCES user_sessions(session_id),
     original_query TEXT NOT NULL,
     normalized_query TEXT,
-    query_preview TEXT,
+    query_preview VARCHAR(500) GENERATED ALWAYS AS (substr(original_query, 1, 500)) STORED,
     query_type VARCHAR(50),
     status VARCHAR(50) NOT NULL DEFAULT 'pending',
     error_message TEXT,
@@ -278,12 +289,13 @@ CREATE TABLE query_templates (
     usage_count INTEGER DEFAULT 0,
     created_by INTEGER REFERENCES users(id),
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP WITH TIME ZONE
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
--- Audit logs
+-- Audit logs (range-partitioned by month on created_at so time-window
+-- queries only scan the matching partitions)
 CREATE TABLE audit_logs (
-    id SERIAL PRIMARY KEY,
+    id BIGSERIAL,
     user_id INTEGER REFERENCES users(id),
     username VARCHAR(100),
     user_role VARCHAR(50),
@@ -302,8 +314,14 @@ CREATE TABLE audit_logs (
     old_values JSONB,
     new_values JSONB,
     details JSONB,
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
-);
+    severity VARCHAR(20) DEFAULT 'info',
+    category VARCHAR(50),
+    risk_score INTEGER DEFAULT 0,
+    is_suspicious BOOLEAN DEFAULT FALSE,
+    alert_triggered BOOLEAN DEFAULT FALSE,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
 
 -- Security events
 CREATE TABLE security_events (
@@ -343,18 +361,20 @@ CREATE TABLE notification_rules (
     is_active BOOLEAN NOT NULL DEFAULT true,
     created_by VARCHAR(100),
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP WITH TIME ZONE
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
 -- Notification delivery log
 CREATE TABLE notification_deliveries (
-    id SERIAL PRIMARY KEY,
+    id BIGSERIAL PRIMARY KEY,
     rule_id INTEGER NOT NULL REFERENCES notification_rules(id) ON DELETE CASCADE,
     channel notification_channel NOT NULL,
     recipient VARCHAR(500) NOT NULL,
     subject TEXT,
     message TEXT,
-    status VARCHAR(50) NOT NULL DEFAULT 'pending',
+    -- Enum member names, as written by the NotificationDelivery model
+    priority VARCHAR(20) NOT NULL DEFAULT 'NORMAL',
+    status VARCHAR(50) NOT NULL DEFAULT 'PENDING',
     response_message TEXT,
     delivery_attempts INTEGER DEFAULT 0,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
@@ -372,7 +392,7 @@ CREATE TABLE email_templates (
     is_active BOOLEAN NOT NULL DEFAULT true,
     created_by VARCHAR(100),
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP WITH TIME ZONE
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
 -- Webhook endpoints
@@ -396,7 +416,7 @@ CREATE TABLE webhook_endpoints (
     last_test_status VARCHAR(50),
     created_by VARCHAR(100),
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP WITH TIME ZONE
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
 -- System backups
@@ -452,7 +472,7 @@ CREATE TABLE system_jobs (
     timeout_minutes INTEGER DEFAULT 60,
     created_by VARCHAR(100),
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP WITH TIME ZONE
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
 -- Job execution history
@@ -490,9 +510,9 @@ CREATE INDEX idx_users_is_active ON users(is_active);
 CREATE INDEX idx_users_created_at ON users(created_at);
 
 CREATE INDEX idx_user_sessions_user_id ON user_sessions(user_id);
-CREATE INDEX idx_user_sessions_session_id ON user_sessions(session_id);
-CREATE INDEX idx_user_sessions_is_active ON user_sessions(is_active);
+CREATE INDEX ix_usersession_user_active ON user_sessions(user_id, is_active, expires_at) WHERE is_active;
 CREATE INDEX idx_user_sessions_expires_at ON user_sessions(expires_at);
+CREATE INDEX ix_usersession_created_brin ON user_sessions USING brin (created_at) WITH (pages_per_range = 32);
 
 CREATE INDEX idx_system_configs_key ON system_configs(key);
 CREATE INDEX idx_system_configs_category ON system_configs(category);
@@ -509,6 +529,8 @@ CREATE INDEX idx_sql_servers_environment ON sql_server_connections(environment);
 
 CREATE INDEX idx_server_health_server_id ON server_health_history(server_id);
 CREATE INDEX idx_server_health_checked_at ON server_health_history(checked_at);
+CREATE INDEX ix_server_ip_whitelist_server_id ON server_ip_whitelist(server_id);
+CREATE INDEX ix_sipw_cidr_gist ON server_ip_whitelist USING gist (cidr inet_ops);
 
 CREATE INDEX idx_query_whitelist_hash ON query_whitelist(query_hash);
 CREATE INDEX idx_query_whitelist_status ON query_whitelist(status);
@@ -519,6 +541,9 @@ CREATE INDEX idx_query_executions_server_id ON query_executions(server_id);
 CREATE INDEX idx_query_executions_started_at ON query_executions(started_at);
 CREATE INDEX idx_query_executions_status ON query_executions(status);
 CREATE INDEX idx_query_executions_query_hash ON query_executions(query_hash);
+CREATE INDEX ix_qexec_user_started ON query_executions(user_id, started_at) INCLUDE (execution_time_ms, rows_returned);
+CREATE INDEX ix_qexec_server_status ON query_executions(server_id, status);
+CREATE INDEX ix_qexec_status_started ON query_executions(status, started_at);
 
 CREATE INDEX idx_query_templates_category ON query_templates(category);
 CREATE INDEX idx_query_templates_is_public ON query_templates(is_public);
@@ -526,19 +551,25 @@ CREATE INDEX idx_query_templates_created_by ON query_templates(created_by);
 
 CREATE INDEX idx_audit_logs_user_id ON audit_logs(user_id);
 CREATE INDEX idx_audit_logs_action ON audit_logs(action);
-CREATE INDEX idx_audit_logs_created_at ON audit_logs(created_at);
+CREATE INDEX ix_audit_created_brin ON audit_logs USING brin (created_at) WITH (pages_per_range = 32);
 CREATE INDEX idx_audit_logs_status ON audit_logs(status);
 CREATE INDEX idx_audit_logs_resource_type ON audit_logs(resource_type);
+CREATE INDEX ix_audit_user_created ON audit_logs(user_id, created_at);
+CREATE INDEX ix_audit_action_created ON audit_logs(action, created_at);
+CREATE INDEX ix_audit_details_gin ON audit_logs USING gin (details);
 
 CREATE INDEX idx_security_events_event_type ON security_events(event_type);
 CREATE INDEX idx_security_events_severity ON security_events(severity);
 CREATE INDEX idx_security_events_occurred_at ON security_events(occurred_at);
 CREATE INDEX idx_security_events_is_resolved ON security_events(is_resolved);
 CREATE INDEX idx_security_events_source_ip ON security_events(source_ip);
+CREATE INDEX ix_secevent_severity_occurred ON security_events(severity, occurred_at);
+CREATE INDEX ix_secevent_type_occurred ON security_events(event_type, occurred_at);
 
 CREATE INDEX idx_notification_deliveries_rule_id ON notification_deliveries(rule_id);
 CREATE INDEX idx_notification_deliveries_status ON notification_deliveries(status);
 CREATE INDEX idx_notification_deliveries_created_at ON notification_deliveries(created_at);
+CREATE INDEX ix_notif_pending ON notification_deliveries(priority, created_at) WHERE status = 'PENDING';
 
 CREATE INDEX idx_system_backups_backup_type ON system_backups(backup_type);
 CREATE INDEX idx_system_backups_created_at ON system_backups(created_at);
@@ -623,6 +654,42 @@ CREATE TRIGGER trigger_users_updated_at
     FOR EACH ROW
     EXECUTE FUNCTION update_timestamp();
 
+-- Role-derived permission bits behind User.is_admin / can_execute_queries
+-- (EXECUTE=1, APPROVE=2, ADMIN=4; see app.models.user.UserPermission).
+-- Idempotent, so it can also be run against an existing database to add
+-- and backfill the column. The trigger keeps rows written outside the ORM
+-- in step with their role.
+ALTER TABLE users ADD COLUMN IF NOT EXISTS permissions_mask INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE users DROP CONSTRAINT IF EXISTS ck_users_permissions_mask;
+ALTER TABLE users ADD CONSTRAINT ck_users_permissions_mask CHECK (permissions_mask >= 0);
+
+CREATE OR REPLACE FUNCTION role_permissions_mask(role_name TEXT)
+RETURNS INTEGER AS $$
+    SELECT CASE lower(role_name)
+        WHEN 'admin' THEN 7
+        WHEN 'analyst' THEN 1
+        WHEN 'powerbi' THEN 1
+        ELSE 0
+    END
+$$ LANGUAGE sql IMMUTABLE;
+
+UPDATE users SET permissions_mask = role_permissions_mask(role::text)
+WHERE permissions_mask IS DISTINCT FROM role_permissions_mask(role::text);
+
+CREATE OR REPLACE FUNCTION sync_permissions_mask()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.permissions_mask = role_permissions_mask(NEW.role::text);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_users_permissions_mask ON users;
+CREATE TRIGGER trigger_users_permissions_mask
+    BEFORE INSERT OR UPDATE OF role ON users
+    FOR EACH ROW
+    EXECUTE FUNCTION sync_permissions_mask();
+
 CREATE TRIGGER trigger_system_configs_updated_at
     BEFORE UPDATE ON system_configs
     FOR EACH ROW
@@ -690,6 +757,82 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
+-- Function to create monthly partitions (current month plus months_ahead)
+-- and a default partition for anything outside them. Parents are
+-- partitioned on created_at. Rows already sitting in the default partition
+-- for a month being created are moved into the new partition; otherwise
+-- PostgreSQL refuses to create it. Called at startup and daily by the
+-- audit service, so partitions stay ahead of the clock.
+CREATE OR REPLACE FUNCTION create_monthly_partitions(parent_table TEXT, months_ahead INTEGER DEFAULT 3)
+RETURNS void AS $$
+DECLARE
+    month_start DATE;
+    month_end DATE;
+    partition_name TEXT;
+    default_name TEXT := parent_table || '_default';
+    has_default BOOLEAN := to_regclass(default_name) IS NOT NULL;
+BEGIN
+    FOR i IN 0..months_ahead LOOP
+        month_start := (date_trunc('month', CURRENT_DATE) + make_interval(months => i))::DATE;
+        month_end := (month_start + INTERVAL '1 month')::DATE;
+        partition_name := parent_table || '_' || to_char(month_start, '"y"YYYY"m"MM');
+        CONTINUE WHEN to_regclass(partition_name) IS NOT NULL;
+        
+        IF has_default THEN
+            EXECUTE format('ALTER TABLE %I DETACH PARTITION %I', parent_table, default_name);
+        END IF;
+        
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+            partition_name, parent_table, month_start, month_end
+        );
+        
+        IF has_default THEN
+            EXECUTE format(
+                'WITH moved AS (DELETE FROM %I WHERE created_at >= %L AND created_at < %L RETURNING *) '
+                'INSERT INTO %I SELECT * FROM moved',
+                default_name, month_start, month_end, parent_table
+            );
+            EXECUTE format('ALTER TABLE %I ATTACH PARTITION %I DEFAULT', parent_table, default_name);
+        END IF;
+    END LOOP;
+    
+    EXECUTE format(
+        'CREATE TABLE IF NOT EXISTS %I PARTITION OF %I DEFAULT',
+        default_name,
+        parent_table
+    );
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT create_monthly_partitions('audit_logs');
+
+-- Function to drop monthly partitions that ended more than retention_days ago;
+-- returns the number of partitions dropped
+CREATE OR REPLACE FUNCTION drop_expired_partitions(parent_table TEXT, retention_days INTEGER)
+RETURNS INTEGER AS $$
+DECLARE
+    partition_name TEXT;
+    dropped INTEGER := 0;
+BEGIN
+    FOR partition_name IN
+        SELECT c.relname
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        JOIN pg_class p ON p.oid = i.inhparent
+        WHERE p.relname = parent_table
+          AND c.relname ~ '_y[0-9]{4}m[0-9]{2}$'
+    LOOP
+        IF (to_date(right(partition_name, 8), '"y"YYYY"m"MM') + INTERVAL '1 month')
+                <= CURRENT_DATE - retention_days THEN
+            EXECUTE format('DROP TABLE IF EXISTS %I', partition_name);
+            dropped := dropped + 1;
+        END IF;
+    END LOOP;
+    RETURN dropped;
+END;
+$$ LANGUAGE plpgsql;
+
 -- Create a scheduled job entry for cleanup
 INSERT INTO system_jobs (job_name, job_type, description, schedule_cron, is_enabled, created_by)
 VALUES (
@@ -1,5 +1,10 @@
 -- Insert default system configurations
-INSERT INTO system_configs (key, name, description, category, config_type, value, default_value, is_sensitive, requires_restart, is_readonly, is_advanced, validation_regex, min_value, max_value) VALUES
+-- Behavior booleans are packed into the flags bitfield (see ConfigFlags)
+INSERT INTO system_configs (key, name, description, category, config_type, value, default_value, flags, validation_regex, min_value, max_value)
+SELECT key, name, description, category::config_category, config_type::config_type, value, default_value,
+    (is_sensitive::int + requires_restart::int * 2 + is_readonly::int * 4 + is_advanced::int * 8)::smallint,
+    validation_regex, min_value, max_value
+FROM (VALUES
 -- System Category
 ('company_name', 'Company Name', 'Name of your organization', 'system', 'string', 'Enterprise Corp', 'Enterprise Corp', false, false, false, false, '^.{1,200}$', NULL, NULL),
 ('system_name', 'System Name', 'Display name for the SQL Proxy system', 'system', 'string', 'Enterprise SQL Proxy', 'Enterprise SQL Proxy', false, false, false, false, '^.{1,200}$', NULL, NULL),
@@ -78,7 +83,8 @@ INSERT INTO system_configs (key, name, description, category, config_type, value
 ('health_check_interval', 'Health Check Interval (Seconds)', 'Interval for health checks', 'monitoring', 'integer', '60', '60', false, false, false, false, NULL, 10, 3600),
 ('alert_threshold_cpu', 'CPU Alert Threshold (%)', 'CPU usage threshold for alerts', 'monitoring', 'integer', '80', '80', false, false, false, false, NULL, 50, 100),
 ('alert_threshold_memory', 'Memory Alert Threshold (%)', 'Memory usage threshold for alerts', 'monitoring', 'integer', '85', '85', false, false, false, false, NULL, 50, 100),
-('alert_threshold_disk', 'Disk Alert Threshold (%)', 'Disk usage threshold for alerts', 'monitoring', 'integer', '90', '90', false, false, false, false, NULL, 50, 100);
+('alert_threshold_disk', 'Disk Alert Threshold (%)', 'Disk usage threshold for alerts', 'monitoring', 'integer', '90', '90', false, false, false, false, NULL, 50, 100)
+) AS defaults (key, name, description, category, config_type, value, default_value, is_sensitive, requires_restart, is_readonly, is_advanced, validation_regex, min_value, max_value);
 
 -- Insert default rate limit profiles
 INSERT INTO rate_limit_profiles (name, description, requests_per_minute, requests_per_hour, requests_per_day, max_concurrent_queries, max_query_duration_seconds, max_result_rows, is_default, created_by) VALUES
@@ -172,7 +178,8 @@ SELECT setval('system_themes_id_seq', 10);
 SELECT setval('system_jobs_id_seq', 100);
 
 -- Create some indexes for better performance on large datasets
-CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_audit_logs_created_at_desc ON audit_logs(created_at DESC);
+-- audit_logs is partitioned, and partitioned tables cannot be indexed CONCURRENTLY
+CREATE INDEX IF NOT EXISTS idx_audit_logs_created_at_desc ON audit_logs(created_at DESC);
 CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_query_executions_user_started ON query_executions(user_id, started_at DESC);
 CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_security_events_occurred_desc ON security_events(occurred_at DESC);
 CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_system_metrics_name_collected ON system_metrics(metric_name, collected_at DESC);